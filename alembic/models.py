@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 
@@ -9,7 +9,7 @@ class Block(Base):
     
     id = Column(Integer, primary_key=True)
     hash = Column(String, unique=True, nullable=False)
-    previous_hash = Column(String, nullable=False)
+    previous_hash = Column(String, nullable=False, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
     nonce = Column(Integer, nullable=False)
     difficulty = Column(Integer, nullable=False)
@@ -24,5 +24,20 @@ class Transaction(Base):
     to_address = Column(String, nullable=False)
     amount = Column(Float, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    block_id = Column(Integer, ForeignKey('blocks.id'))
-    block = relationship('Block', back_populates='transactions')
\ No newline at end of file
+    block_id = Column(Integer, ForeignKey('blocks.id'), index=True)
+    block = relationship('Block', back_populates='transactions')
+
+    # Address history: filter by either side, ordered by block
+    __table_args__ = (
+        Index('ix_transactions_from_address_block_id', 'from_address', 'block_id'),
+        Index('ix_transactions_to_address_block_id', 'to_address', 'block_id'),
+    )
+
+class Account(Base):
+    __tablename__ = 'accounts'
+    
+    id = Column(Integer, primary_key=True)
+    address = Column(String, unique=True, nullable=False)
+    balance = Column(Float, default=0.0)
+    nonce = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
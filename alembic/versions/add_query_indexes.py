@@ -0,0 +1,33 @@
+"""Add indexes for address and chain-link queries
+
+Revision ID: add_query_indexes
+Revises: initial_migration
+Create Date: 2024-02-05
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = 'add_query_indexes'
+down_revision = 'initial_migration'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_blocks_previous_hash', 'blocks', ['previous_hash']),
+    ('ix_transactions_block_id', 'transactions', ['block_id']),
+    # Leading on the address, these also serve plain address filters
+    ('ix_transactions_from_address_block_id', 'transactions', ['from_address', 'block_id']),
+    ('ix_transactions_to_address_block_id', 'transactions', ['to_address', 'block_id']),
+]
+
+def upgrade():
+    # Build concurrently on PostgreSQL so live tables keep taking writes
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -11,6 +11,8 @@ setup(
         'sqlalchemy',
         'alembic',
         'psycopg2-binary',
+        'asyncpg',
+        'cryptography>=40',
     ],
     python_requires='>=3.8',
 )
\ No newline at end of file
@@ -1,10 +1,18 @@
-from fastapi import FastAPI, HTTPException, WebSocket
+from fastapi import Depends, FastAPI, HTTPException, WebSocket
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from decimal import Decimal
+from ..database.connection import dispose_async_engine, get_async_db
+from ..database.models import Account
 
 app = FastAPI(title="ADAC Blockchain API")
 
+@app.on_event("shutdown")
+async def close_database_pool():
+    await dispose_async_engine()
+
 class TransactionRequest(BaseModel):
     sender: str
     recipient: str
@@ -40,4 +48,12 @@ async def stake_tokens(address: str, amount: float):
 @app.get("/balance/{address}")
 async def get_balance(address: str):
     balance = blockchain.get_balance(address)
-    return {"address": address, "balance": float(balance)}
\ No newline at end of file
+    return {"address": address, "balance": float(balance)}
+
+@app.get("/accounts/{address}")
+async def get_account(address: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Account).where(Account.address == address))
+    account = result.scalar_one_or_none()
+    if account is None:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return {"address": account.address, "balance": account.balance, "nonce": account.nonce}
\ No newline at end of file
@@ -1,24 +1,204 @@
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence
 import hashlib
+from .codec import decode_block, encode_block, encode_header, encode_header_prefix
+from .merkle import ProofStep, merkle_proof, merkle_root
+from .mining import find_nonce_parallel
+from .transaction import transaction_hash
 
-@dataclass
 class Block:
-    index: int
-    timestamp: float
-    transactions: List[dict]
-    previous_hash: str
-    nonce: int = 0
-    
+    """A block that can be filled and mined, then sealed.
+
+    Sealing freezes the block: transactions become a tuple, the Merkle root
+    and header hash are computed once and stored, and any further attribute
+    assignment raises. Sealed blocks never rehash on `hash` lookups; unsealed
+    blocks recompute both on every read, since their body can still change.
+    """
+
+    __slots__ = ("index", "timestamp", "transactions", "previous_hash", "nonce",
+                 "_merkle_root", "_hash")
+
+    is_pruned = False
+
+    def __init__(self,
+                 index: int,
+                 timestamp: float,
+                 transactions: Sequence[dict],
+                 previous_hash: str,
+                 nonce: int = 0):
+        self.index = index
+        self.timestamp = timestamp
+        self.transactions = transactions
+        self.previous_hash = previous_hash
+        self.nonce = nonce
+        self._merkle_root: Optional[str] = None
+        self._hash: Optional[str] = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_hash", None) is not None:
+            raise AttributeError(f"Cannot set '{name}' on a sealed block")
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        return (_restore_block, (self.index, self.timestamp, self.transactions,
+                                 self.previous_hash, self.nonce, self._merkle_root, self._hash))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Block):
+            return NotImplemented
+        return ((self.index, self.timestamp, list(self.transactions), self.previous_hash,
+                 self.nonce) ==
+                (other.index, other.timestamp, list(other.transactions), other.previous_hash,
+                 other.nonce))
+
+    def __repr__(self) -> str:
+        return (f"Block(index={self.index!r}, timestamp={self.timestamp!r}, "
+                f"transactions={self.transactions!r}, previous_hash={self.previous_hash!r}, "
+                f"nonce={self.nonce!r})")
+
+    @property
+    def is_sealed(self) -> bool:
+        return self._hash is not None
+
+    @property
+    def hash(self) -> str:
+        """Stored header hash of a sealed block, computed on demand before sealing"""
+        return self._hash if self._hash is not None else self.calculate_hash()
+
+    @property
+    def merkle_root(self) -> str:
+        """Stored Merkle root of a sealed block, computed fresh before sealing"""
+        if self._hash is not None:
+            return self._merkle_root
+        return merkle_root(self.transaction_hashes())
+
+    def seal(self) -> "Block":
+        """Freeze the block and store its Merkle root and header hash"""
+        if self._hash is None:
+            self.transactions = tuple(self.transactions)
+            self._seal(merkle_root(self.transaction_hashes()))
+        return self
+
+    def _seal(self, root: str) -> None:
+        self._merkle_root = root
+        object.__setattr__(self, "_hash", self._header_hash(root))
+
+    def transaction_hashes(self) -> List[str]:
+        return [
+            tx.calculate_hash() if hasattr(tx, "calculate_hash") else transaction_hash(tx)
+            for tx in self.transactions
+        ]
+
+    def has_valid_merkle_root(self) -> bool:
+        """Check the cached root still matches the transactions in the body"""
+        return self.merkle_root == merkle_root(self.transaction_hashes())
+
+    def get_merkle_proof(self, index: int) -> List[ProofStep]:
+        return merkle_proof(self.transaction_hashes(), index)
+
+    def to_dict(self) -> Dict:
+        """Convert the block to dictionary format"""
+        return {
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "transactions": list(self.transactions),
+            "previous_hash": self.previous_hash,
+            "nonce": self.nonce,
+            "merkle_root": self.merkle_root,
+            "hash": self.hash
+        }
+
+    def serialize_header_prefix(self) -> memoryview:
+        """Encode the header without its trailing nonce"""
+        return encode_header_prefix(self.index, self.timestamp, self.merkle_root,
+                                    self.previous_hash)
+
+    def serialize_header(self) -> memoryview:
+        return encode_header(self.index, self.timestamp, self.merkle_root, self.previous_hash,
+                             self.nonce)
+
+    def serialize(self) -> memoryview:
+        """Encode the header and transactions with the canonical binary codec"""
+        return encode_block(self.serialize_header(), self.transactions)
+
+    @classmethod
+    def deserialize(cls, data) -> "Block":
+        """Decode a block; decoded blocks come back sealed"""
+        header, transactions = decode_block(data)
+        block = cls(header["index"], header["timestamp"], tuple(transactions),
+                    header["previous_hash"], header["nonce"])
+        block._seal(header["merkle_root"])
+        return block
+
+    def calculate_hash(self) -> str:
+        return self._header_hash(self.merkle_root)
+
+    def _header_hash(self, root: str) -> str:
+        header = encode_header(self.index, self.timestamp, root, self.previous_hash, self.nonce)
+        return hashlib.sha256(header).hexdigest()
+
+    def header(self) -> "BlockHeader":
+        """Header-only copy of a sealed block, for pruned nodes"""
+        self.seal()
+        return BlockHeader(self.index, self.timestamp, self.previous_hash, self.nonce,
+                           self.merkle_root, self.hash)
+
+    def mine_block(self, difficulty: int, workers: int = 1) -> str:
+        """Find a nonce meeting the difficulty, then seal the block with the root it was mined on"""
+        self.transactions = tuple(self.transactions)
+        root = merkle_root(self.transaction_hashes())
+        prefix = encode_header_prefix(self.index, self.timestamp, root, self.previous_hash)
+        result = find_nonce_parallel(prefix, difficulty, workers, start_nonce=self.nonce)
+        self.nonce = result.nonce
+        self._seal(root)
+        return self.hash
+
+class BlockHeader:
+    """A block whose body has been pruned.
+
+    Keeps the fields the header hash commits to, so hash and link checks
+    still work, but no transactions.
+    """
+
+    __slots__ = ("index", "timestamp", "previous_hash", "nonce", "merkle_root", "hash")
+
+    is_pruned = True
+    is_sealed = True
+    transactions = ()
+
+    def __init__(self, index: int, timestamp: float, previous_hash: str, nonce: int,
+                 merkle_root: str, block_hash: str):
+        self.index = index
+        self.timestamp = timestamp
+        self.previous_hash = previous_hash
+        self.nonce = nonce
+        self.merkle_root = merkle_root
+        self.hash = block_hash
+
+    def __repr__(self) -> str:
+        return f"BlockHeader(index={self.index!r}, hash={self.hash!r})"
+
+    def transaction_hashes(self) -> List[str]:
+        return []
+
+    def to_dict(self) -> Dict:
+        return {
+            "index": self.index,
+            "timestamp": self.timestamp,
+            "previous_hash": self.previous_hash,
+            "nonce": self.nonce,
+            "merkle_root": self.merkle_root,
+            "hash": self.hash
+        }
+
+    def serialize_header(self) -> memoryview:
+        return encode_header(self.index, self.timestamp, self.merkle_root, self.previous_hash,
+                             self.nonce)
+
     def calculate_hash(self) -> str:
-        block_string = f"{self.index}{self.timestamp}{self.transactions}{self.previous_hash}{self.nonce}"
-        return hashlib.sha256(block_string.encode()).hexdigest()
-
-    def mine_block(self, difficulty: int) -> str:
-        target = '0' * difficulty
-        while True:
-            hash_value = self.calculate_hash()
-            if hash_value[:difficulty] == target:
-                return hash_value
-            self.nonce += 1
\ No newline at end of file
+        return hashlib.sha256(self.serialize_header()).hexdigest()
+
+def _restore_block(index, timestamp, transactions, previous_hash, nonce, root, block_hash) -> Block:
+    block = Block(index, timestamp, transactions, previous_hash, nonce)
+    block._merkle_root = root
+    object.__setattr__(block, "_hash", block_hash)
+    return block
@@ -0,0 +1,80 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from .ledger import BalanceLedger
+from .mempool import Mempool
+
+@dataclass
+class BlockTemplate:
+    transactions: List[dict] = field(default_factory=list)
+    tx_hashes: List[str] = field(default_factory=list)
+    total_bytes: int = 0
+    total_fees: float = 0
+    fill_ratio: float = 0
+
+    def to_dict(self) -> Dict:
+        """Convert template metrics to dictionary format"""
+        return {
+            "transaction_count": len(self.transactions),
+            "total_bytes": self.total_bytes,
+            "total_fees": self.total_fees,
+            "fill_ratio": self.fill_ratio
+        }
+
+class BlockTemplateBuilder:
+    """Selects the most valuable valid set of pending transactions for a block"""
+
+    def __init__(self, max_transactions: int = 2000, max_bytes: int = 1024 * 1024):
+        self.max_transactions = max_transactions
+        self.max_bytes = max_bytes
+
+    def build(self, mempool: Mempool, ledger: Optional[BalanceLedger] = None) -> BlockTemplate:
+        """Fill a template from the mempool in fee-rate order.
+
+        Transactions that do not fit the remaining byte budget are skipped in
+        favour of smaller ones further down. Once a sender has a transaction
+        skipped, its later ones are left for a future block to keep its order.
+        Senders that cannot cover a spend from their confirmed balance, or
+        whose next transaction does not carry their next nonce, are skipped
+        the same way when a ledger is given.
+        """
+        template = BlockTemplate()
+        spent: Dict[str, float] = {}
+        nonces: Dict[str, int] = {}
+        blocked_senders = set()
+
+        for entry in mempool.iter_by_priority():
+            if len(template.transactions) >= self.max_transactions:
+                break
+
+            sender = entry.transaction["from"]
+            if sender in blocked_senders:
+                continue
+
+            if template.total_bytes + entry.size > self.max_bytes:
+                blocked_senders.add(sender)
+                continue
+
+            cost = entry.transaction["amount"] + entry.fee
+            if ledger is not None and ledger.get_balance(sender) < spent.get(sender, 0) + cost:
+                blocked_senders.add(sender)
+                continue
+
+            nonce = entry.transaction.get("nonce")
+            if (ledger is not None and nonce is not None and
+                    nonce != nonces.get(sender, ledger.get_nonce(sender))):
+                blocked_senders.add(sender)
+                continue
+
+            spent[sender] = spent.get(sender, 0) + cost
+            if nonce is not None:
+                nonces[sender] = nonce + 1
+            template.transactions.append(entry.transaction)
+            template.tx_hashes.append(entry.tx_hash)
+            template.total_bytes += entry.size
+            template.total_fees += entry.fee
+
+        template.fill_ratio = max(
+            len(template.transactions) / self.max_transactions,
+            template.total_bytes / self.max_bytes
+        )
+        return template
@@ -0,0 +1,37 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+class BlockCache:
+    """Chain tip and a bounded LRU of recent block hash -> id for BlockchainCore.
+
+    Only committed blocks go in, and everything is dropped on rollback, so a
+    hit is always something the database holds.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.tip: Optional[Tuple[int, str]] = None  # (id, hash)
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get_id(self, block_hash: str) -> Optional[int]:
+        block_id = self._ids.get(block_hash)
+        if block_id is not None:
+            self._ids.move_to_end(block_hash)
+        return block_id
+
+    def remember(self, block_id: int, block_hash: str) -> None:
+        self._ids[block_hash] = block_id
+        self._ids.move_to_end(block_hash)
+        while len(self._ids) > self.capacity:
+            self._ids.popitem(last=False)
+
+    def set_tip(self, block_id: int, block_hash: str) -> None:
+        self.tip = (block_id, block_hash)
+        self.remember(block_id, block_hash)
+
+    def invalidate(self) -> None:
+        self.tip = None
+        self._ids.clear()
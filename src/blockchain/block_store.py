@@ -0,0 +1,181 @@
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Tuple, Union
+import mmap
+import os
+import struct
+from .block import Block
+
+class BlockStore:
+    """Segmented append-only block log with memory-mapped reads.
+
+    Blocks are appended to numbered segment files and located through a
+    fixed-width index file of (segment, offset, length) records, one per
+    height. Reads go through mmap and only the most recently used blocks are
+    kept decoded in memory, so resident memory does not grow with the chain.
+    The store behaves like a read-mostly list of blocks.
+    """
+
+    INDEX_RECORD = struct.Struct(">IQI")
+    INDEX_FILE = "index.dat"
+
+    def __init__(self, directory: str, segment_size: int = 64 * 1024 * 1024,
+                 cache_size: int = 256, sync: bool = False):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.cache_size = cache_size
+        self.sync = sync
+        self._cache: "OrderedDict[int, Block]" = OrderedDict()
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._index: List[Tuple[int, int, int]] = []
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+        self._index_file = open(os.path.join(directory, self.INDEX_FILE), "ab")
+        segment = self._index[-1][0] if self._index else 0
+        self._open_segment(segment)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"blocks_{segment:05d}.dat")
+
+    def _load_index(self) -> None:
+        """Read the index, dropping a torn trailing record or unindexed segment tail"""
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return
+
+        with open(path, "rb") as index_file:
+            data = index_file.read()
+        record_size = self.INDEX_RECORD.size
+        complete = len(data) - len(data) % record_size
+        self._index = [
+            self.INDEX_RECORD.unpack_from(data, offset)
+            for offset in range(0, complete, record_size)
+        ]
+        if complete != len(data):
+            with open(path, "r+b") as index_file:
+                index_file.truncate(complete)
+
+        # A crash between the data and index writes leaves bytes nobody points to
+        if self._index:
+            segment, offset, length = self._index[-1]
+            segment_path = self._segment_path(segment)
+            if os.path.getsize(segment_path) > offset + length:
+                with open(segment_path, "r+b") as segment_file:
+                    segment_file.truncate(offset + length)
+
+    def _open_segment(self, segment: int) -> None:
+        self._segment = segment
+        self._segment_file = open(self._segment_path(segment), "ab")
+        self._segment_offset = self._segment_file.tell()
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        """Get a read-only map of a segment covering at least `end` bytes"""
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < end:
+            if mapped is not None:
+                mapped.close()
+            if segment == self._segment:
+                self._segment_file.flush()
+            with open(self._segment_path(segment), "rb") as segment_file:
+                mapped = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mapped
+        return mapped
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[Block]:
+        for height in range(len(self._index)):
+            yield self.get(height)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Block, List[Block]]:
+        if isinstance(key, slice):
+            return [self.get(height) for height in range(*key.indices(len(self._index)))]
+        if key < 0:
+            key += len(self._index)
+        if not 0 <= key < len(self._index):
+            raise IndexError("block height out of range")
+        return self.get(key)
+
+    def append(self, block: Block) -> int:
+        """Seal and append a block, returning its height"""
+        data = block.seal().serialize()
+        if self._segment_offset and self._segment_offset + len(data) > self.segment_size:
+            self._segment_file.close()
+            self._open_segment(self._segment + 1)
+
+        offset = self._segment_offset
+        self._segment_file.write(data)
+        self._segment_file.flush()
+        if self.sync:
+            os.fsync(self._segment_file.fileno())
+        self._segment_offset += len(data)
+
+        # The index record goes last so it never points at missing data
+        self._index_file.write(self.INDEX_RECORD.pack(self._segment, offset, len(data)))
+        self._index_file.flush()
+        if self.sync:
+            os.fsync(self._index_file.fileno())
+        self._index.append((self._segment, offset, len(data)))
+
+        height = len(self._index) - 1
+        self._remember(height, block)
+        return height
+
+    def truncate(self, length: int) -> None:
+        """Drop every block from height `length` up, e.g. to roll back a fork"""
+        if length >= len(self._index):
+            return
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
+        self._segment_file.close()
+        for height in [height for height in self._cache if height >= length]:
+            del self._cache[height]
+
+        del self._index[length:]
+        segment, end = 0, 0
+        if self._index:
+            segment, offset, size = self._index[-1]
+            end = offset + size
+        # Shrink the index before the data so it never points at missing bytes
+        self._index_file.truncate(length * self.INDEX_RECORD.size)
+        if self.sync:
+            os.fsync(self._index_file.fileno())
+        for later in range(segment + 1, self._segment + 1):
+            os.unlink(self._segment_path(later))
+        with open(self._segment_path(segment), "r+b") as segment_file:
+            segment_file.truncate(end)
+        self._open_segment(segment)
+
+    def get(self, height: int) -> Block:
+        """Get a block by height, decoding it from the log on a cache miss"""
+        block = self._cache.get(height)
+        if block is not None:
+            self._cache.move_to_end(height)
+            return block
+
+        segment, offset, length = self._index[height]
+        mapped = self._map(segment, offset + length)
+        with memoryview(mapped) as view, view[offset:offset + length] as record:
+            block = Block.deserialize(record)
+        self._remember(height, block)
+        return block
+
+    def get_raw(self, height: int) -> bytes:
+        """Get the encoded bytes of a block without decoding it"""
+        segment, offset, length = self._index[height]
+        return self._map(segment, offset + length)[offset:offset + length]
+
+    def _remember(self, height: int, block: Block) -> None:
+        self._cache[height] = block
+        self._cache.move_to_end(height)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def close(self) -> None:
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
+        self._segment_file.close()
+        self._index_file.close()
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from .block import Block
+
+@dataclass
+class TreeNode:
+    block: Block
+    height: int
+    cumulative_weight: int
+
+class BlockTree:
+    """Recent blocks of every known branch, with the heaviest tip tracked as they connect.
+
+    Blocks whose parent has not arrived yet wait in a bounded orphan pool,
+    keyed by the missing parent hash, and are handed back once it connects.
+    Only nodes from root_height up are kept; see prune.
+    """
+
+    def __init__(self, max_orphans: int = 1000):
+        self.max_orphans = max_orphans
+        self.nodes: Dict[str, TreeNode] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.by_height: Dict[int, List[str]] = {}
+        self.tip: Optional[TreeNode] = None
+        self.root_height = 0
+        self.orphans: "OrderedDict[str, Block]" = OrderedDict()
+        self.orphans_by_parent: Dict[str, List[str]] = {}
+
+    def __contains__(self, block_hash: str) -> bool:
+        return block_hash in self.nodes or block_hash in self.orphans
+
+    def get(self, block_hash: str) -> Optional[TreeNode]:
+        return self.nodes.get(block_hash)
+
+    def set_root(self, block: Block, cumulative_weight: int) -> TreeNode:
+        """Start the tree from a single trusted block"""
+        self.__init__(self.max_orphans)
+        node = TreeNode(block, block.index, cumulative_weight)
+        self._link(node)
+        self.root_height = node.height
+        self.tip = node
+        return node
+
+    def insert(self, block: Block, weight: int) -> TreeNode:
+        """Attach a block under its parent, which must already be in the tree"""
+        parent = self.nodes[block.previous_hash]
+        node = TreeNode(block, parent.height + 1, parent.cumulative_weight + weight)
+        self._link(node)
+        self.children.setdefault(parent.block.hash, []).append(block.hash)
+        # Ties keep the tip that was seen first
+        if node.cumulative_weight > self.tip.cumulative_weight:
+            self.tip = node
+        return node
+
+    def _link(self, node: TreeNode) -> None:
+        self.nodes[node.block.hash] = node
+        self.by_height.setdefault(node.height, []).append(node.block.hash)
+
+    def add_orphan(self, block: Block) -> None:
+        """Hold a block until its parent arrives, evicting the oldest orphan when full"""
+        if block.hash in self.orphans:
+            return
+        self.orphans[block.hash] = block
+        self.orphans_by_parent.setdefault(block.previous_hash, []).append(block.hash)
+        while len(self.orphans) > self.max_orphans:
+            _, evicted = self.orphans.popitem(last=False)
+            siblings = self.orphans_by_parent[evicted.previous_hash]
+            siblings.remove(evicted.hash)
+            if not siblings:
+                del self.orphans_by_parent[evicted.previous_hash]
+
+    def take_orphans(self, parent_hash: str) -> List[Block]:
+        """Remove and return the orphans waiting for a parent"""
+        children = self.orphans_by_parent.pop(parent_hash, [])
+        return [self.orphans.pop(block_hash) for block_hash in children]
+
+    def prune(self, root_height: int, root_hash: str) -> None:
+        """Forget everything below root_height and every branch not descending from root_hash"""
+        while self.root_height < root_height:
+            for block_hash in self.by_height.pop(self.root_height, []):
+                del self.nodes[block_hash]
+                self.children.pop(block_hash, None)
+            self.root_height += 1
+        for block_hash in list(self.by_height.get(root_height, [])):
+            if block_hash != root_hash:
+                self._remove_subtree(block_hash)
+
+    def _remove_subtree(self, block_hash: str) -> None:
+        stack = [block_hash]
+        while stack:
+            node = self.nodes.pop(stack.pop())
+            self.by_height[node.height].remove(node.block.hash)
+            stack.extend(self.children.pop(node.block.hash, []))
@@ -1,19 +1,160 @@
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional
+import os
+import threading
 from .block import Block
+from .block_builder import BlockTemplate, BlockTemplateBuilder
+from .block_store import BlockStore
+from .indexes import ChainIndex
+from .ingestion import precheck_transaction
+from .ledger import BalanceLedger
+from .mempool import Mempool
+from .snapshot import SnapshotManager
+from .stats import ChainStats
+from .validation import ChainValidator, ValidationResult
 from ..consensus.pos import ProofOfStake, Validator
 
+if TYPE_CHECKING:
+    from ..monitoring.metrics_collector import MetricsCollector
+
 class Blockchain:
-    def __init__(self):
-        self.chain = [self.create_genesis_block()]
-        self.pending_transactions = []
+    def __init__(self, mempool: Optional[Mempool] = None,
+                 block_builder: Optional[BlockTemplateBuilder] = None,
+                 block_store: Optional[BlockStore] = None,
+                 snapshot_manager: Optional[SnapshotManager] = None,
+                 stats_window: int = 100,
+                 prune_depth: Optional[int] = None,
+                 metrics: Optional["MetricsCollector"] = None):
+        # With a block store the chain lives on disk and only recent blocks stay decoded
+        self.block_store = block_store
+        if block_store is not None:
+            if not len(block_store):
+                block_store.append(self.create_genesis_block())
+            self.chain = block_store
+        else:
+            self.chain = [self.create_genesis_block()]
+        self.mempool = mempool if mempool is not None else Mempool()
+        self.block_builder = block_builder or BlockTemplateBuilder()
+        self.last_block_template: Optional[BlockTemplate] = None
+        # Receives fill ratio and fees of every produced block when set
+        self.metrics = metrics
         self.pos = ProofOfStake()
         self.block_reward = 100
         self.minimum_transaction_fee = 0.001
+        self.ledger = BalanceLedger()
+        self.snapshot_manager = snapshot_manager
+        self.stats = ChainStats(stats_window)
+        self.indexes = ChainIndex(
+            os.path.join(block_store.directory, "chain_index.json")
+            if block_store is not None else None
+        )
+        # Archive nodes (prune_depth=None) keep every body in memory. Pruned
+        # nodes keep the last prune_depth bodies and reduce older blocks to
+        # their headers; a block store already keeps bodies on disk instead.
+        self.prune_depth = prune_depth if block_store is None else None
+        self.pruned_height = -1
+        self.pruned_ledger = BalanceLedger()
+        # Serializes mempool and ledger writers: block production, direct
+        # submissions and the ingestion pipeline's writer thread
+        self.lock = threading.RLock()
+        self.restore_state()
         
     def create_genesis_block(self) -> Block:
         """Create the genesis block"""
-        return Block(datetime.now(), [], "0")
+        return Block(0, datetime.now(), [], "0").seal()
+
+    def load_chain(self, chain: List[Block]) -> None:
+        """Replace the chain and rebuild the balance ledger and indexes from it.
+
+        Balances can only be replayed from full bodies, so a chain containing
+        pruned headers is rejected before any state changes. With a block
+        store the new chain is written through: blocks after the first height
+        where it differs from the store are replaced on disk.
+        """
+        chain = list(chain)
+        if any(block.is_pruned for block in chain):
+            raise ValueError("cannot load a chain containing pruned blocks")
+        with self.lock:
+            if self.block_store is not None:
+                self._write_through(chain)
+            else:
+                self.chain = chain
+            self.ledger.rebuild(self.chain)
+            self.stats.rebuild(self.chain)
+            self.indexes.rebuild(self.chain)
+            self.pruned_height = -1
+            self.pruned_ledger = BalanceLedger()
+            self.prune()
+
+    def _write_through(self, chain: List[Block]) -> None:
+        store = self.block_store
+        common = 0
+        while common < min(len(store), len(chain)) and store[common].hash == chain[common].hash:
+            common += 1
+        store.truncate(common)
+        for block in chain[common:]:
+            store.append(block)
+
+    def restore_state(self) -> None:
+        """Rebuild derived state, starting from the latest usable snapshot if any.
+
+        A snapshot is only used if it records nonces and the chain still contains
+        its block, then just the blocks above its height are replayed into the ledger.
+        """
+        self._restore_indexes()
+
+        snapshot = self.snapshot_manager.load_latest() if self.snapshot_manager else None
+        if (snapshot is None or snapshot.nonces is None or snapshot.height >= len(self.chain) or
+                self.chain[snapshot.height].hash != snapshot.block_hash):
+            self.ledger.rebuild(self.chain)
+            self.stats.rebuild(self.chain)
+            return
+
+        self.snapshot_manager.restore(snapshot, self.ledger, self.pos, self.stats)
+        if snapshot.stats is None:
+            self.stats.rebuild(self.chain[:snapshot.height + 1])
+        for height in range(snapshot.height + 1, len(self.chain)):
+            self.ledger.apply_block(self.chain[height])
+            self.stats.add_block(self.chain[height])
+
+    def _restore_indexes(self) -> None:
+        """Load persisted indexes if they match the chain, then index the rest"""
+        height = self.indexes.indexed_height if self.indexes.load() else -1
+        if height >= len(self.chain) or (
+                height >= 0 and self.indexes.get_height(self.chain[height].hash) != height):
+            self.indexes.rebuild(self.chain)
+        else:
+            self.indexes.catch_up(self.chain)
+
+    def prune(self) -> None:
+        """Reduce blocks deeper than prune_depth to headers.
+
+        Their transactions are folded into pruned_ledger first, so the
+        remaining bodies can still be validated from that base.
+        """
+        if self.prune_depth is None:
+            return
+        while len(self.chain) - 1 - self.pruned_height > self.prune_depth:
+            height = self.pruned_height + 1
+            block = self.chain[height]
+            self.pruned_ledger.apply_block(block)
+            self.indexes.prune_block(block)
+            self.chain[height] = block.header()
+            self.pruned_height = height
+
+    def take_snapshot(self) -> Optional[str]:
+        """Write a snapshot of the state as of the latest block, persisting the indexes with it"""
+        self.indexes.save()
+        if self.snapshot_manager is None:
+            return None
+        latest_block = self.get_latest_block()
+        return self.snapshot_manager.write(latest_block.index, latest_block.hash, self.ledger,
+                                           self.pos, self.stats)
+
+    @property
+    def pending_transactions(self) -> List[Dict]:
+        """Pending transactions in arrival order"""
+        return list(self.mempool)
 
     def get_latest_block(self) -> Block:
         """Get the most recent block in the chain"""
@@ -29,73 +170,181 @@ class Blockchain:
 
     def process_block(self, validator_address: str) -> Optional[Block]:
         """Process pending transactions and create a new block"""
-        if not self.pending_transactions:
+        with self.lock:
+            return self._process_block(validator_address)
+
+    def _process_block(self, validator_address: str) -> Optional[Block]:
+        if not self.mempool:
             return None
 
         # Get the next validator
         if validator_address != self.pos.get_next_validator():
             return None
 
+        # Fill the block with the most valuable transactions that fit
+        template = self.block_builder.build(self.mempool, self.ledger)
+        if not template.transactions:
+            return None
+
         # Create new block
         new_block = Block(
+            len(self.chain),
             datetime.now(),
-            self.pending_transactions,
+            list(template.transactions),
             self.get_latest_block().hash
         )
 
         # Validate the block
-        if not self.pos.validate_block(validator_address, new_block.__dict__):
+        if not self.pos.validate_block(validator_address, new_block.to_dict()):
             return None
 
-        # Calculate and add validator reward
+        # Calculate and add validator reward; the height keeps each reward's hash unique
         reward = self.pos.calculate_rewards(validator_address, self.block_reward)
         reward_tx = {
             "from": "network",
             "to": validator_address,
             "amount": reward,
-            "type": "reward"
+            "type": "reward",
+            "block": new_block.index
         }
         new_block.transactions.append(reward_tx)
+        new_block.seal()
 
-        # Add block to chain
+        # Add block to chain and update balances
+        self.ledger.apply_block(new_block)
         self.chain.append(new_block)
-        self.pending_transactions = []
+        self.indexes.add_block(new_block)
+        self.stats.add_block(new_block)
+        self.mempool.remove_many(template.tx_hashes)
+        self.last_block_template = template
+        if self.metrics is not None:
+            self.metrics.update_block_template_metrics(template.fill_ratio, template.total_fees)
+        self.prune()
+
+        if self.snapshot_manager and self.snapshot_manager.should_snapshot(new_block.index):
+            self.take_snapshot()
 
         return new_block
 
-    def add_transaction(self, sender: str, recipient: str, amount: float, fee: float = None) -> bool:
-        """Add a new transaction to pending transactions"""
+    def add_transaction(self, sender: str, recipient: str, amount: float, fee: float = None,
+                        nonce: Optional[int] = None) -> bool:
+        """Add a new transaction to pending transactions.
+
+        Takes the sender's next nonce unless one is given.
+        """
         if fee is None:
             fee = self.minimum_transaction_fee
+        with self.lock:
+            if nonce is None:
+                nonce = self.get_next_nonce(sender)
 
-        if fee < self.minimum_transaction_fee:
-            return False
+            admission = precheck_transaction({
+                "from": sender,
+                "to": recipient,
+                "amount": amount,
+                "fee": fee,
+                "nonce": nonce,
+                "timestamp": datetime.now().isoformat()
+            }, self.minimum_transaction_fee)
+            if not admission.accepted:
+                return False
 
-        if self.get_balance(sender) < amount + fee:
-            return False
+            return self.admit_transaction(admission.transaction, admission.tx_hash,
+                                          admission.size) is None
 
-        self.pending_transactions.append({
-            "from": sender,
-            "to": recipient,
-            "amount": amount,
-            "fee": fee,
-            "timestamp": datetime.now().isoformat()
-        })
+    def admit_transaction(self, transaction: Dict, tx_hash: Optional[str] = None,
+                          size: Optional[int] = None) -> Optional[str]:
+        """Stateful admission of a prechecked transaction, returning a rejection reason or None.
 
-        return True
+        Only this step reads chain state; IngestionPipeline runs it on a
+        single writer after the stateless checks, holding the chain lock so it
+        never interleaves with block production. The nonce must be exactly the
+        sender's next one, so replays and gaps are rejected in O(1).
+        """
+        with self.lock:
+            return self._admit_transaction(transaction, tx_hash, size)
+
+    def _admit_transaction(self, transaction: Dict, tx_hash: Optional[str],
+                           size: Optional[int]) -> Optional[str]:
+        sender, nonce = transaction["from"], transaction["nonce"]
+        if nonce < self.ledger.get_nonce(sender):
+            return "stale nonce"
+        next_nonce = self.get_next_nonce(sender)
+        if nonce < next_nonce:
+            return "duplicate nonce"
+        if nonce > next_nonce:
+            return "nonce gap"
+        if self.get_available_balance(sender) < transaction["amount"] + transaction.get("fee", 0):
+            return "insufficient balance"
+        if self.mempool.add(transaction, tx_hash, size) is None:
+            return "rejected by mempool"
+        return None
 
     def get_balance(self, address: str) -> float:
         """Get the balance of an address"""
-        balance = 0
-        for block in self.chain:
-            for transaction in block.transactions:
-                if transaction["from"] == address:
-                    balance -= transaction["amount"]
-                    if "fee" in transaction:
-                        balance -= transaction["fee"]
-                if transaction["to"] == address:
-                    balance += transaction["amount"]
-        return balance
+        return self.ledger.get_balance(address)
+
+    def get_nonce(self, address: str) -> int:
+        """Get the nonce the next confirmed transaction from an address must carry"""
+        return self.ledger.get_nonce(address)
+
+    def get_next_nonce(self, address: str) -> int:
+        """Get the nonce for a new transaction, after any pending ones"""
+        pending = self.mempool.next_nonce(address)
+        return pending if pending is not None else self.ledger.get_nonce(address)
+
+    def get_available_balance(self, address: str) -> float:
+        """Get the confirmed balance minus what pending transactions already spend"""
+        return self.ledger.get_balance(address) - self.mempool.get_reserved(address)
+
+    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
+        """Find a block by hash without scanning the chain"""
+        height = self.indexes.get_height(block_hash)
+        return self.chain[height] if height is not None else None
+
+    def get_transaction(self, tx_hash: str) -> Optional[Dict]:
+        """Find a confirmed transaction by hash, with its block height and position.
+
+        Transactions in pruned blocks are no longer indexed and return None.
+        """
+        position = self.indexes.get_position(tx_hash)
+        if position is None:
+            return None
+        height, index = position
+        return {
+            "block_height": height,
+            "position": index,
+            "transaction": self.chain[height].transactions[index]
+        }
+
+    def get_address_history(self, address: str) -> List[Dict]:
+        """Get every confirmed transaction sent or received by an address, oldest first"""
+        return [
+            {
+                "block_height": height,
+                "position": index,
+                "transaction": self.chain[height].transactions[index]
+            }
+            for height, index in self.indexes.get_address_positions(address)
+        ]
+
+    def get_transaction_proof(self, height: int, index: int) -> Dict:
+        """Get a Merkle inclusion proof for a transaction, for light clients.
+
+        Verify it with verify_merkle_proof, passing the position and transaction count.
+        Raises ValueError for pruned heights, whose transactions are gone.
+        """
+        block = self.chain[height]
+        if block.is_pruned:
+            raise ValueError(f"block {height} is pruned; its transactions are no longer stored")
+        return {
+            "block_hash": block.hash,
+            "merkle_root": block.merkle_root,
+            "transaction": block.transactions[index],
+            "position": index,
+            "transaction_count": len(block.transactions),
+            "proof": block.get_merkle_proof(index)
+        }
 
     def get_validator_info(self, address: str) -> Optional[Dict]:
         """Get information about a validator"""
@@ -112,45 +361,30 @@ class Blockchain:
 
     def is_chain_valid(self) -> bool:
         """Verify the integrity of the blockchain"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
+        return self.validate_chain().is_valid
 
-            # Verify current block hash
-            if current_block.hash != current_block.calculate_hash():
-                return False
+    def validate_chain(self, parallel: bool = False,
+                       workers: Optional[int] = None) -> ValidationResult:
+        """Validate the whole chain and report the first invalid height, if any.
 
-            # Verify block link
-            if current_block.previous_hash != previous_block.hash:
-                return False
-
-            # Verify transactions in block
-            for tx in current_block.transactions:
-                if tx["from"] != "network":  # Skip reward transactions
-                    sender_balance = self.get_balance(tx["from"])
-                    if sender_balance < tx["amount"]:
-                        return False
-
-        return True
+        With parallel=True block hashes and links are verified on a process
+        pool sized to the core count (or workers) before the balance replay.
+        """
+        validator = ChainValidator(parallel=parallel, workers=workers)
+        return validator.validate(self.chain, self.pruned_ledger)
 
     def get_blockchain_stats(self) -> Dict:
         """Get statistical information about the blockchain"""
+        stats = self.stats.to_dict()
         return {
-            "total_blocks": len(self.chain),
-            "total_transactions": sum(len(block.transactions) for block in self.chain),
+            "total_blocks": stats["total_blocks"],
+            "total_transactions": stats["total_transactions"],
             "total_validators": len(self.pos.validators),
             "total_stake": self.pos.total_stake,
-            "average_block_time": self._calculate_average_block_time()
+            "average_block_time": stats["average_block_time"],
+            "min_block_interval": stats["min_block_interval"],
+            "max_block_interval": stats["max_block_interval"],
+            "recent": stats["window"],
+            "pending_transactions": len(self.mempool),
+            "last_block": self.last_block_template.to_dict() if self.last_block_template else None
         }
-
-    def _calculate_average_block_time(self) -> float:
-        """Calculate the average time between blocks"""
-        if len(self.chain) < 2:
-            return 0
-
-        total_time = 0
-        for i in range(1, len(self.chain)):
-            time_diff = (self.chain[i].timestamp - self.chain[i-1].timestamp).total_seconds()
-            total_time += time_diff
-
-        return total_time / (len(self.chain) - 1)
@@ -1,12 +1,35 @@
-from typing import List
+from collections import Counter
+from typing import List, Optional
 from .block import Block
+from .block_store import BlockStore
+from .block_tree import BlockTree, TreeNode
+from .mining import block_work
+from .transaction import transaction_hash
 from datetime import datetime
 
 class Blockchain:
-    def __init__(self, difficulty: int = 4):
-        self.chain: List[Block] = [self.create_genesis_block()]
+    def __init__(self, difficulty: int = 4, mining_workers: int = 1,
+                 block_store: Optional[BlockStore] = None,
+                 max_reorg_depth: int = 100, max_orphans: int = 1000):
+        if block_store is not None:
+            if not len(block_store):
+                block_store.append(self.create_genesis_block())
+            self.chain = block_store
+        else:
+            self.chain: List[Block] = [self.create_genesis_block()]
         self.difficulty = difficulty
+        self.mining_workers = mining_workers
         self.pending_transactions = []
+
+        # The main chain is the heaviest branch of the tree; only the last
+        # max_reorg_depth blocks of it can still be reorganized away.
+        self.max_reorg_depth = max_reorg_depth
+        self.tree = BlockTree(max_orphans)
+        work = block_work(difficulty)
+        start = max(0, len(self.chain) - 1 - max_reorg_depth)
+        self.tree.set_root(self.chain[start], (start + 1) * work)
+        for height in range(start + 1, len(self.chain)):
+            self.tree.insert(self.chain[height], work)
         
     def create_genesis_block(self) -> Block:
         return Block(
@@ -14,26 +37,121 @@ class Blockchain:
             timestamp=datetime.now().timestamp(),
             transactions=[],
             previous_hash="0" * 64
-        )
+        ).seal()
         
     def get_latest_block(self) -> Block:
         return self.chain[-1]
         
     def add_block(self, block: Block) -> bool:
-        if self.is_valid_block(block):
-            self.chain.append(block)
+        """Add a block to the tree, switching the main chain if its branch becomes the heaviest.
+
+        A block whose parent is unknown is held as an orphan until the parent
+        arrives. Returns False for invalid or already known blocks.
+        """
+        if block.hash in self.tree:
+            return False
+        if self.tree.get(block.previous_hash) is None:
+            if not self.has_valid_proof(block):
+                return False
+            self.tree.add_orphan(block)
             return True
-        return False
+        if not self._connect(block):
+            return False
+        if self.tree.tip.block.hash != self.get_latest_block().hash:
+            self._switch_to(self.tree.tip)
+        return True
+
+    def _connect(self, block: Block) -> bool:
+        """Insert a block and any orphans it unblocks, dropping invalid orphans"""
+        work = block_work(self.difficulty)
+        waiting = [block]
+        while waiting:
+            candidate = waiting.pop()
+            parent = self.tree.get(candidate.previous_hash)
+            if not self.is_valid_block(candidate, parent.block):
+                if candidate is block:
+                    return False
+                continue
+            self.tree.insert(candidate, work)
+            waiting.extend(self.tree.take_orphans(candidate.hash))
+        return True
+
+    def _on_main_chain(self, node: TreeNode) -> bool:
+        return node.height < len(self.chain) and self.chain[node.height].hash == node.block.hash
+
+    def _switch_to(self, tip: TreeNode) -> None:
+        """Make the branch ending at tip the main chain, touching only blocks past the fork"""
+        branch = []
+        node = tip
+        while not self._on_main_chain(node):
+            branch.append(node.block)
+            node = self.tree.get(node.block.previous_hash)
+        branch.reverse()
+
+        fork_height = node.height
+        disconnected = self.chain[fork_height + 1:]
+        if isinstance(self.chain, BlockStore):
+            self.chain.truncate(fork_height + 1)
+        else:
+            del self.chain[fork_height + 1:]
+        for block in branch:
+            self.chain.append(block)
+
+        # Transactions from abandoned blocks go back to pending unless the new branch has them;
+        # identical transactions are counted, so each confirmation settles only one copy
+        confirmed = Counter(transaction_hash(tx) for block in branch for tx in block.transactions)
+        returned = [tx for block in disconnected for tx in block.transactions]
+        pending = []
+        for tx in returned + self.pending_transactions:
+            tx_hash = transaction_hash(tx)
+            if confirmed[tx_hash]:
+                confirmed[tx_hash] -= 1
+            else:
+                pending.append(tx)
+        self.pending_transactions = pending
+
+        root_height = tip.height - self.max_reorg_depth
+        if root_height > self.tree.root_height:
+            self.tree.prune(root_height, self.chain[root_height].hash)
         
-    def is_valid_block(self, block: Block) -> bool:
-        previous_block = self.get_latest_block()
-        if block.index != previous_block.index + 1:
+    def has_valid_proof(self, block: Block) -> bool:
+        """Checks that need no parent: the block is sealed and meets the difficulty.
+
+        The header hash and Merkle root are recomputed, one header hash and one
+        tree pass, so a body swapped under an honest header is rejected.
+        """
+        if not block.is_sealed or block.hash[:self.difficulty] != '0' * self.difficulty:
             return False
-        if block.previous_hash != previous_block.calculate_hash():
+        return block.hash == block.calculate_hash() and block.has_valid_merkle_root()
+
+    def is_valid_block(self, block: Block, previous_block: Optional[Block] = None) -> bool:
+        """Check a block against its parent, the current tip by default"""
+        if previous_block is None:
+            previous_block = self.get_latest_block()
+        if block.index != previous_block.index + 1:
             return False
-        if block.calculate_hash()[:self.difficulty] != '0' * self.difficulty:
+        if block.previous_hash != previous_block.hash:
             return False
-        return True
+        return self.has_valid_proof(block)
+
+    def mine_pending_transactions(self) -> Optional[Block]:
+        """Mine the pending transactions into a new block across mining_workers processes"""
+        if not self.pending_transactions:
+            return None
+
+        previous_block = self.get_latest_block()
+        block = Block(
+            index=previous_block.index + 1,
+            timestamp=datetime.now().timestamp(),
+            transactions=list(self.pending_transactions),
+            previous_hash=previous_block.hash
+        )
+        block.mine_block(self.difficulty, self.mining_workers)
+
+        # Connecting the block clears its transactions from pending
+        if not self.add_block(block):
+            return None
+        return block
 
     def add_transaction(self, transaction: dict) -> int:
         self.pending_transactions.append(transaction)
@@ -0,0 +1,201 @@
+"""Canonical length-prefixed binary encoding for headers, transactions and blocks.
+
+Every value is written as a one byte type tag followed by its payload.
+Variable length payloads carry a big-endian uint32 length prefix, maps are
+written with their keys sorted, so equal values always encode to equal
+bytes regardless of Python version or dict insertion order.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple, Union
+import struct
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_NONE = b"N"
+_TRUE = b"T"
+_FALSE = b"F"
+_INT = b"I"
+_FLOAT = b"D"
+_DECIMAL = b"d"
+_STR = b"S"
+_BYTES = b"B"
+_DATETIME = b"X"
+_LIST = b"L"
+_MAP = b"M"
+
+_BLOCK_MAGIC = b"ADB1"
+_LENGTH = struct.Struct(">I")
+_DOUBLE = struct.Struct(">d")
+_NONCE = struct.Struct(">Q")
+
+NONCE_SIZE = _NONCE.size
+
+def _write_sized(out: bytearray, tag: bytes, payload: bytes) -> None:
+    out += tag
+    out += _LENGTH.pack(len(payload))
+    out += payload
+
+def _write(out: bytearray, value: Any) -> None:
+    if value is None:
+        out += _NONE
+    elif value is True:
+        out += _TRUE
+    elif value is False:
+        out += _FALSE
+    elif isinstance(value, int):
+        length = value.bit_length() // 8 + 1
+        out += _INT
+        out += bytes((length,))
+        out += value.to_bytes(length, "big", signed=True)
+    elif isinstance(value, float):
+        out += _FLOAT
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, Decimal):
+        _write_sized(out, _DECIMAL, str(value).encode())
+    elif isinstance(value, str):
+        _write_sized(out, _STR, value.encode())
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _write_sized(out, _BYTES, bytes(value))
+    elif isinstance(value, datetime):
+        _write_sized(out, _DATETIME, value.isoformat().encode())
+    elif isinstance(value, (list, tuple)):
+        out += _LIST
+        out += _LENGTH.pack(len(value))
+        for item in value:
+            _write(out, item)
+    elif isinstance(value, dict):
+        out += _MAP
+        out += _LENGTH.pack(len(value))
+        for key in sorted(value, key=lambda key: str(key).encode()):
+            _write(out, str(key))
+            _write(out, value[key])
+    else:
+        raise TypeError(f"Cannot encode value of type {type(value).__name__}")
+
+def _read_sized(view: memoryview, offset: int) -> Tuple[memoryview, int]:
+    (length,) = _LENGTH.unpack_from(view, offset)
+    offset += _LENGTH.size
+    return view[offset:offset + length], offset + length
+
+def _read(view: memoryview, offset: int) -> Tuple[Any, int]:
+    tag = bytes(view[offset:offset + 1])
+    offset += 1
+    if tag == _NONE:
+        return None, offset
+    if tag == _TRUE:
+        return True, offset
+    if tag == _FALSE:
+        return False, offset
+    if tag == _INT:
+        length = view[offset]
+        offset += 1
+        return int.from_bytes(view[offset:offset + length], "big", signed=True), offset + length
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(view, offset)[0], offset + _DOUBLE.size
+    if tag in (_DECIMAL, _STR, _BYTES, _DATETIME):
+        payload, offset = _read_sized(view, offset)
+        if tag == _BYTES:
+            return payload.tobytes(), offset
+        text = str(payload, "utf-8")
+        if tag == _DECIMAL:
+            return Decimal(text), offset
+        if tag == _DATETIME:
+            return datetime.fromisoformat(text), offset
+        return text, offset
+    if tag == _LIST:
+        (count,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        items = []
+        for _ in range(count):
+            item, offset = _read(view, offset)
+            items.append(item)
+        return items, offset
+    if tag == _MAP:
+        (count,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        mapping = {}
+        for _ in range(count):
+            key, offset = _read(view, offset)
+            mapping[key], offset = _read(view, offset)
+        return mapping, offset
+    raise ValueError(f"Unknown type tag {tag!r} at offset {offset - 1}")
+
+def encode(value: Any) -> memoryview:
+    """Encode a value into its canonical binary form"""
+    out = bytearray()
+    _write(out, value)
+    return memoryview(out)
+
+def decode(data: Buffer) -> Any:
+    """Decode a single value, rejecting trailing bytes"""
+    view = memoryview(data)
+    value, offset = _read(view, 0)
+    if offset != len(view):
+        raise ValueError("Trailing bytes after encoded value")
+    return value
+
+def encode_transaction(transaction: Union[Dict, Any]) -> memoryview:
+    """Encode a transaction dict, or any object exposing its fields via __dict__"""
+    if not isinstance(transaction, dict):
+        transaction = {
+            key: value for key, value in vars(transaction).items() if not key.startswith("_")
+        }
+    return encode(transaction)
+
+def encode_header_prefix(index: int, timestamp: Any, merkle_root: str,
+                         previous_hash: str) -> memoryview:
+    """Encode every header field except the nonce"""
+    out = bytearray(_BLOCK_MAGIC)
+    _write(out, [index, timestamp, merkle_root, previous_hash])
+    return memoryview(out)
+
+def encode_nonce(nonce: int) -> bytes:
+    """Encode the nonce as the fixed-width suffix of a header"""
+    return _NONCE.pack(nonce)
+
+def encode_header(index: int, timestamp: Any, merkle_root: str, previous_hash: str,
+                  nonce: int) -> memoryview:
+    """Encode a block header; the nonce is always the last eight bytes"""
+    out = bytearray(encode_header_prefix(index, timestamp, merkle_root, previous_hash))
+    out += encode_nonce(nonce)
+    return memoryview(out)
+
+def decode_header(data: Buffer) -> Dict[str, Any]:
+    view = memoryview(data)
+    if bytes(view[:len(_BLOCK_MAGIC)]) != _BLOCK_MAGIC:
+        raise ValueError("Not an encoded block header")
+    fields, offset = _read(view, len(_BLOCK_MAGIC))
+    (nonce,) = _NONCE.unpack_from(view, offset)
+    index, timestamp, merkle_root, previous_hash = fields
+    return {
+        "index": index,
+        "timestamp": timestamp,
+        "merkle_root": merkle_root,
+        "previous_hash": previous_hash,
+        "nonce": nonce,
+        "size": offset + NONCE_SIZE
+    }
+
+def encode_block(header: Buffer, transactions: List[Any]) -> memoryview:
+    """Encode a block as its header followed by the length-prefixed transactions"""
+    out = bytearray(header)
+    out += _LENGTH.pack(len(transactions))
+    for transaction in transactions:
+        payload = encode_transaction(transaction)
+        out += _LENGTH.pack(len(payload))
+        out += payload
+    return memoryview(out)
+
+def decode_block(data: Buffer) -> Tuple[Dict[str, Any], List[Any]]:
+    """Decode a block into its header fields and transactions"""
+    view = memoryview(data)
+    header = decode_header(view)
+    offset = header.pop("size")
+    (count,) = _LENGTH.unpack_from(view, offset)
+    offset += _LENGTH.size
+    transactions = []
+    for _ in range(count):
+        payload, offset = _read_sized(view, offset)
+        transactions.append(decode(payload))
+    return header, transactions
@@ -1,22 +1,39 @@
 import hashlib
+import weakref
 from datetime import datetime, UTC
 from typing import List, Optional
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from src.models import Block, Transaction
+from src.blockchain.block_cache import BlockCache
+from src.blockchain.mining import ascii_nonce, find_nonce_parallel
+from src.blockchain.persistence import BlockWriter
+from src.models import Account, Block, Transaction
 
 class BlockchainCore:
-    def __init__(self, db: Session, difficulty: int = 4):
+    def __init__(self, db: Session, difficulty: int = 4, mining_workers: int = 1,
+                 blocks_per_commit: int = 1, block_cache_size: int = 1024):
         self.db = db
         self.difficulty = difficulty
+        self.mining_workers = mining_workers
         self.pending_transactions: List[Transaction] = []
+        # Tip and recent hashes are served from memory; this assumes the core
+        # is the only writer of blocks to the database
+        self.block_cache = BlockCache(block_cache_size)
+        # The session only holds a weak reference back, so it never keeps a
+        # core alive; the listener is removed on close() or garbage collection
+        listener = _rollback_listener(weakref.ref(self))
+        event.listen(db, "after_rollback", listener)
+        self._remove_listener = weakref.finalize(self, event.remove, db, "after_rollback", listener)
+        # Raise blocks_per_commit while catching up to group blocks into one commit
+        self.writer = BlockWriter(db, blocks_per_commit, on_commit=self._blocks_committed)
         
     def create_block(self, miner_address: str) -> Block:
         """Create a new block with pending transactions"""
-        last_block = self.db.query(Block).order_by(Block.id.desc()).first()
+        tip_hash = self._tip_hash()
         
         # Create the new block
         new_block = Block(
-            previous_hash=last_block.hash if last_block else '0' * 64,
+            previous_hash=tip_hash if tip_hash else '0' * 64,
             timestamp=datetime.now(UTC),
             nonce=0,
             difficulty=self.difficulty
@@ -34,17 +51,12 @@ class BlockchainCore:
         block_transactions = [reward_tx] + self.pending_transactions
         transaction_str = ''.join(tx.hash for tx in block_transactions)
         
-        # Mine the block
-        target = '0' * self.difficulty
-        while True:
-            block_string = f"{new_block.previous_hash}{transaction_str}{new_block.timestamp}{new_block.nonce}"
-            block_hash = hashlib.sha256(block_string.encode()).hexdigest()
-            
-            if block_hash.startswith(target):
-                new_block.hash = block_hash
-                break
-                
-            new_block.nonce += 1
+        # Mine the block, hashing the constant header prefix only once
+        header_prefix = f"{new_block.previous_hash}{transaction_str}{new_block.timestamp}".encode()
+        result = find_nonce_parallel(header_prefix, self.difficulty, self.mining_workers,
+                                     nonce_encoder=ascii_nonce)
+        new_block.nonce = result.nonce
+        new_block.hash = result.hash
         
         # Assign transactions to block
         new_block.transactions = block_transactions
@@ -81,13 +93,73 @@ class BlockchainCore:
             return False
             
         # Verify previous block hash
-        previous_block = self.db.query(Block).filter(Block.hash == block.previous_hash).first()
-        if not previous_block and block.previous_hash != '0' * 64:  # Allow genesis block
+        # Allow genesis block
+        if not self._has_block(block.previous_hash) and block.previous_hash != '0' * 64:
             return False
             
         return True
     
+    def save_block(self, block: Block) -> None:
+        """Persist a block and its transactions, committing once a batch of blocks is buffered"""
+        self.writer.add(block)
+
+    def flush(self) -> None:
+        """Commit any blocks still buffered"""
+        self.writer.flush()
+
+    def close(self) -> None:
+        """Commit buffered blocks and detach from the session"""
+        try:
+            self.flush()
+        finally:
+            self._remove_listener()
+
+    def _tip_hash(self) -> Optional[str]:
+        """Hash of the newest block, buffered or committed.
+
+        Reads the database only on a cold cache.
+        """
+        if self.writer.pending:
+            return self.writer.pending[-1].hash
+        if self.block_cache.tip is None:
+            last_block = self.db.query(Block.id, Block.hash).order_by(Block.id.desc()).first()
+            if last_block is None:
+                return None
+            self.block_cache.set_tip(last_block.id, last_block.hash)
+        return self.block_cache.tip[1]
+
+    def _has_block(self, block_hash: str) -> bool:
+        if (self.writer.find_pending(block_hash) is not None or
+                self.block_cache.get_id(block_hash) is not None):
+            return True
+        block_id = self.db.query(Block.id).filter(Block.hash == block_hash).scalar()
+        if block_id is None:
+            return False
+        self.block_cache.remember(block_id, block_hash)
+        return True
+
+    def _blocks_committed(self, blocks: List[Block]) -> None:
+        for block in blocks:
+            self.block_cache.remember(block.id, block.hash)
+        self.block_cache.set_tip(blocks[-1].id, blocks[-1].hash)
+
+    def _rolled_back(self, session: Session) -> None:
+        # Whatever was read or written in the rolled back transaction may be gone
+        self.block_cache.invalidate()
+
+    def get_balance(self, address: str) -> float:
+        """Read a committed balance from the accounts table by its indexed address"""
+        balance = self.db.query(Account.balance).filter(Account.address == address).scalar()
+        return balance or 0.0
+
     @staticmethod
     def _generate_hash(data: str) -> str:
         """Generate a hash for the given data"""
-        return hashlib.sha256(data.encode()).hexdigest()
\ No newline at end of file
+        return hashlib.sha256(data.encode()).hexdigest()
+
+def _rollback_listener(core_ref: "weakref.ref[BlockchainCore]"):
+    def rolled_back(session: Session) -> None:
+        core = core_ref()
+        if core is not None:
+            core._rolled_back(session)
+    return rolled_back
@@ -0,0 +1,113 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import tempfile
+
+# (block height, position of the transaction within the block)
+TxPosition = Tuple[int, int]
+
+class ChainIndex:
+    """Secondary indexes over the chain, maintained as blocks are appended.
+
+    Maps block hash -> height, transaction hash -> position and
+    address -> positions of every transaction it sent or received.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.block_heights: Dict[str, int] = {}
+        self.transactions: Dict[str, TxPosition] = {}
+        self.addresses: Dict[str, List[TxPosition]] = {}
+        self.indexed_height = -1
+
+    def add_block(self, block) -> None:
+        """Index a block; blocks must be added in height order"""
+        height = block.index
+        self.block_heights[block.hash] = height
+        tx_hashes = block.transaction_hashes()
+        for position, (tx, tx_hash) in enumerate(zip(block.transactions, tx_hashes)):
+            self.transactions[tx_hash] = (height, position)
+            participants = {tx["from"], tx["to"]} if isinstance(tx, dict) else set()
+            for address in participants:
+                self.addresses.setdefault(address, []).append((height, position))
+        self.indexed_height = height
+
+    def prune_block(self, block) -> None:
+        """Drop transaction entries of a block whose body is being pruned.
+
+        Blocks are pruned oldest first, so their entries sit at the front of
+        each address list. The block hash stays indexed with its header.
+        """
+        height = block.index
+        for tx, tx_hash in zip(block.transactions, block.transaction_hashes()):
+            self.transactions.pop(tx_hash, None)
+            if not isinstance(tx, dict):
+                continue
+            for address in {tx["from"], tx["to"]}:
+                positions = self.addresses.get(address)
+                if not positions:
+                    continue
+                drop = 0
+                while drop < len(positions) and positions[drop][0] <= height:
+                    drop += 1
+                del positions[:drop]
+                if not positions:
+                    del self.addresses[address]
+
+    def catch_up(self, chain) -> None:
+        """Index any blocks the index has not seen yet"""
+        for height in range(self.indexed_height + 1, len(chain)):
+            self.add_block(chain[height])
+
+    def rebuild(self, chain: Iterable) -> None:
+        self.block_heights = {}
+        self.transactions = {}
+        self.addresses = {}
+        self.indexed_height = -1
+        for block in chain:
+            self.add_block(block)
+
+    def get_height(self, block_hash: str) -> Optional[int]:
+        return self.block_heights.get(block_hash)
+
+    def get_position(self, tx_hash: str) -> Optional[TxPosition]:
+        return self.transactions.get(tx_hash)
+
+    def get_address_positions(self, address: str) -> List[TxPosition]:
+        return self.addresses.get(address, [])
+
+    def save(self) -> None:
+        """Persist the indexes atomically next to the chain"""
+        if self.path is None:
+            return
+        state = {
+            "indexed_height": self.indexed_height,
+            "block_heights": self.block_heights,
+            "transactions": self.transactions,
+            "addresses": self.addresses
+        }
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as temp_file:
+                json.dump(state, temp_file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def load(self) -> bool:
+        """Load persisted indexes, returning False if there are none"""
+        if self.path is None or not os.path.exists(self.path):
+            return False
+        with open(self.path) as index_file:
+            state = json.load(index_file)
+        self.indexed_height = state["indexed_height"]
+        self.block_heights = state["block_heights"]
+        self.transactions = {
+            tx_hash: tuple(position) for tx_hash, position in state["transactions"].items()
+        }
+        self.addresses = {
+            address: [tuple(position) for position in positions]
+            for address, positions in state["addresses"].items()
+        }
+        return True
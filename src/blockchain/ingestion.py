@@ -0,0 +1,123 @@
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from numbers import Number
+from typing import List, Optional
+import hashlib
+import os
+from .signatures import verify_signature
+from .transaction import serialize_transaction, signing_payload
+
+@dataclass
+class Admission:
+    transaction: dict
+    tx_hash: Optional[str] = None
+    size: int = 0
+    reason: Optional[str] = None
+
+    @property
+    def accepted(self) -> bool:
+        return self.reason is None
+
+def precheck_transaction(transaction: dict,
+                         minimum_fee: float,
+                         require_signature: bool = False,
+                         network_address: str = "network") -> Admission:
+    """Stateless admission checks: schema, nonce format, fee floor, hash and signature.
+
+    Needs nothing but the transaction itself, so it can run on any worker.
+    """
+    admission = Admission(transaction)
+    if not isinstance(transaction, dict):
+        admission.reason = "malformed transaction"
+        return admission
+    sender, recipient = transaction.get("from"), transaction.get("to")
+    amount, fee = transaction.get("amount"), transaction.get("fee", 0)
+    nonce = transaction.get("nonce")
+    if not isinstance(sender, str) or not isinstance(recipient, str):
+        admission.reason = "malformed transaction"
+    elif not isinstance(nonce, int) or isinstance(nonce, bool) or nonce < 0:
+        admission.reason = "invalid nonce"
+    elif not isinstance(amount, Number) or not isinstance(fee, Number) or amount <= 0 or fee < 0:
+        admission.reason = "invalid amount"
+    elif sender == network_address:
+        admission.reason = "reserved sender"
+    elif fee < minimum_fee:
+        admission.reason = "fee below minimum"
+    if admission.reason:
+        return admission
+
+    payload = serialize_transaction(transaction)
+    admission.tx_hash = hashlib.sha256(payload).hexdigest()
+    admission.size = len(payload)
+
+    signature = transaction.get("signature")
+    if signature is None:
+        if require_signature:
+            admission.reason = "missing signature"
+    elif not verify_signature(sender, signing_payload(transaction), signature):
+        admission.reason = "invalid signature"
+    return admission
+
+def _precheck_chunk(transactions: List[dict], minimum_fee: float, require_signature: bool,
+                    network_address: str) -> List[Admission]:
+    return [
+        precheck_transaction(tx, minimum_fee, require_signature, network_address)
+        for tx in transactions
+    ]
+
+class IngestionPipeline:
+    """Two-stage transaction admission for a Blockchain.
+
+    Stage 1 runs the stateless checks on a worker pool, a chunk of the batch
+    per task. Stage 2 runs the nonce and balance checks and the mempool insert
+    on a single writer thread, in submission order, under the blockchain's
+    lock so it never overlaps block production; only that cheap part is
+    serialized.
+    """
+
+    def __init__(self, blockchain, workers: Optional[int] = None, processes: bool = False,
+                 require_signatures: bool = False, chunk_size: int = 256,
+                 network_address: str = "network"):
+        self.blockchain = blockchain
+        self.workers = workers or os.cpu_count() or 1
+        self.require_signatures = require_signatures
+        self.chunk_size = chunk_size
+        self.network_address = network_address
+        pool_type = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self._validators = pool_type(max_workers=self.workers)
+        self._writer = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, transactions: List[dict]) -> "Future[List[Admission]]":
+        """Queue a batch; the future resolves to one Admission per transaction, in order"""
+        prechecks = [
+            self._validators.submit(_precheck_chunk, transactions[start:start + self.chunk_size],
+                                    self.blockchain.minimum_transaction_fee,
+                                    self.require_signatures, self.network_address)
+            for start in range(0, len(transactions), self.chunk_size)
+        ]
+        return self._writer.submit(self._admit, prechecks)
+
+    def admit(self, transactions: List[dict]) -> List[Admission]:
+        """Run a batch through both stages and wait for the outcome"""
+        return self.submit(transactions).result()
+
+    def _admit(self, prechecks: List["Future[List[Admission]]"]) -> List[Admission]:
+        admissions = []
+        for precheck in prechecks:
+            for admission in precheck.result():
+                if admission.accepted:
+                    admission.reason = self.blockchain.admit_transaction(
+                        admission.transaction, admission.tx_hash, admission.size
+                    )
+                admissions.append(admission)
+        return admissions
+
+    def close(self) -> None:
+        self._writer.shutdown()
+        self._validators.shutdown()
+
+    def __enter__(self) -> "IngestionPipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,62 @@
+from typing import Dict, Iterable, List
+
+class BalanceLedger:
+    """Account state maintained incrementally as blocks are appended.
+
+    Tracks each address's balance and the next nonce it must use.
+    """
+
+    def __init__(self):
+        self.balances: Dict[str, float] = {}
+        self.nonces: Dict[str, int] = {}
+
+    def get_balance(self, address: str) -> float:
+        """Get the confirmed balance of an address in O(1)"""
+        return self.balances.get(address, 0)
+
+    def get_nonce(self, address: str) -> int:
+        """Get the nonce the next transaction from an address must carry"""
+        return self.nonces.get(address, 0)
+
+    def apply_transactions(self, transactions: List[dict]) -> None:
+        """Apply a batch of transactions all at once.
+
+        Updates are staged first and merged in a single step, so a malformed
+        transaction leaves the ledger untouched.
+        """
+        staged: Dict[str, float] = {}
+        staged_nonces: Dict[str, int] = {}
+        for transaction in transactions:
+            sender = transaction["from"]
+            if "nonce" in transaction:
+                staged_nonces[sender] = transaction["nonce"] + 1
+            balance = staged.get(sender, self.get_balance(sender))
+            balance -= transaction["amount"]
+            if "fee" in transaction:
+                balance -= transaction["fee"]
+            staged[sender] = balance
+
+            recipient = transaction["to"]
+            staged[recipient] = (staged.get(recipient, self.get_balance(recipient)) +
+                                 transaction["amount"])
+
+        self.balances.update(staged)
+        self.nonces.update(staged_nonces)
+
+    def apply_block(self, block) -> None:
+        """Apply every transaction of a block to the ledger"""
+        self.apply_transactions(block.transactions)
+
+    def rebuild(self, chain: Iterable) -> None:
+        """Rebuild the ledger from scratch by replaying a chain"""
+        self.balances = {}
+        self.nonces = {}
+        for block in chain:
+            self.apply_block(block)
+
+    def copy(self) -> "BalanceLedger":
+        """Return an independent copy of the ledger"""
+        ledger = BalanceLedger()
+        ledger.balances = dict(self.balances)
+        ledger.nonces = dict(self.nonces)
+        return ledger
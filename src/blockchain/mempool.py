@@ -0,0 +1,222 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import heapq
+import itertools
+from .transaction import serialize_transaction
+
+@dataclass
+class MempoolEntry:
+    transaction: dict
+    tx_hash: str
+    size: int
+    fee: float
+    sequence: int
+
+    @property
+    def fee_rate(self) -> float:
+        """Fee paid per serialized byte"""
+        return self.fee / self.size if self.size else 0
+
+class Mempool:
+    """Bounded pool of pending transactions ordered by fee rate.
+
+    Transactions are indexed by hash for O(1) duplicate rejection and queued
+    per sender in nonce order, or arrival order for transactions without a
+    nonce; a second transaction reusing a pending (sender, nonce) is
+    rejected. When the pool exceeds its count or byte cap the entries paying
+    the lowest fee rate are evicted first, together with any later nonces of
+    the same sender that would be left behind a gap. The amount each sender
+    has committed to pending spends is tracked alongside, so admission can
+    account for it without scanning the pool.
+    """
+
+    def __init__(self, max_transactions: int = 50000, max_bytes: int = 32 * 1024 * 1024):
+        self.max_transactions = max_transactions
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries: Dict[str, MempoolEntry] = {}
+        self.by_sender: Dict[str, Deque[str]] = {}
+        self.by_nonce: Dict[Tuple[str, int], str] = {}  # (sender, nonce) -> tx hash
+        self.reserved: Dict[str, float] = {}  # sender -> pending amount + fees
+        self._eviction_heap: List[tuple] = []  # (fee_rate, -sequence, tx_hash)
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, tx_hash: str) -> bool:
+        return tx_hash in self.entries
+
+    def __iter__(self) -> Iterator[dict]:
+        """Iterate pending transactions in arrival order"""
+        for entry in sorted(self.entries.values(), key=lambda entry: entry.sequence):
+            yield entry.transaction
+
+    def add(self, transaction: dict, tx_hash: Optional[str] = None,
+            size: Optional[int] = None) -> Optional[str]:
+        """Add a transaction, returning its hash or None if it was rejected.
+
+        Callers that already serialized the transaction can pass its hash and
+        size to skip doing it again.
+        """
+        if tx_hash is None or size is None:
+            payload = serialize_transaction(transaction)
+            tx_hash = hashlib.sha256(payload).hexdigest()
+            size = len(payload)
+        sender = transaction["from"]
+        nonce = transaction.get("nonce")
+        if tx_hash in self.entries or (sender, nonce) in self.by_nonce:
+            return None
+
+        entry = MempoolEntry(
+            transaction=transaction,
+            tx_hash=tx_hash,
+            size=size,
+            fee=transaction.get("fee", 0),
+            sequence=next(self._sequence)
+        )
+
+        # A full pool only admits transactions that outbid its cheapest entry
+        if self._is_full(entry.size):
+            lowest = self._lowest_entry()
+            if lowest is None or entry.fee_rate <= lowest.fee_rate:
+                return None
+
+        self.entries[tx_hash] = entry
+        self._enqueue(sender, nonce, tx_hash)
+        self.reserved[sender] = self.reserved.get(sender, 0) + self._spend(transaction)
+        heapq.heappush(self._eviction_heap, (entry.fee_rate, -entry.sequence, tx_hash))
+        self.total_bytes += entry.size
+
+        self._evict()
+        return tx_hash if tx_hash in self.entries else None
+
+    def remove(self, tx_hash: str) -> Optional[dict]:
+        """Remove a transaction from the pool, returning it if it was present"""
+        entry = self.entries.pop(tx_hash, None)
+        if entry is None:
+            return None
+
+        sender = entry.transaction["from"]
+        self.by_nonce.pop((sender, entry.transaction.get("nonce")), None)
+        queue = self.by_sender[sender]
+        queue.remove(tx_hash)
+        if queue:
+            self.reserved[sender] -= self._spend(entry.transaction)
+        else:
+            # Drop the reservation outright so rounding errors never accumulate
+            del self.by_sender[sender]
+            del self.reserved[sender]
+
+        self.total_bytes -= entry.size
+        return entry.transaction
+
+    def remove_many(self, tx_hashes: List[str]) -> None:
+        """Remove several transactions, e.g. once they are included in a block"""
+        for tx_hash in tx_hashes:
+            self.remove(tx_hash)
+
+        # Removed entries linger in the eviction heap, compact it once they dominate
+        if len(self._eviction_heap) > 2 * len(self.entries) + 1024:
+            self._eviction_heap = [item for item in self._eviction_heap if item[2] in self.entries]
+            heapq.heapify(self._eviction_heap)
+
+    def _enqueue(self, sender: str, nonce: Optional[int], tx_hash: str) -> None:
+        """Queue a hash under its sender, keeping the queue in nonce order"""
+        queue = self.by_sender.setdefault(sender, deque())
+        if nonce is None:
+            queue.append(tx_hash)
+            return
+        self.by_nonce[(sender, nonce)] = tx_hash
+
+        # Nonces normally arrive in order, so this is an append
+        position = len(queue)
+        while position > 0 and self._nonce_of(queue[position - 1]) > nonce:
+            position -= 1
+        queue.insert(position, tx_hash)
+
+    def _nonce_of(self, tx_hash: str) -> int:
+        nonce = self.entries[tx_hash].transaction.get("nonce")
+        return -1 if nonce is None else nonce
+
+    def next_nonce(self, sender: str) -> Optional[int]:
+        """Nonce following the sender's last pending transaction, or None if it has none"""
+        queue = self.by_sender.get(sender)
+        if not queue:
+            return None
+        nonce = self.entries[queue[-1]].transaction.get("nonce")
+        return None if nonce is None else nonce + 1
+
+    def get_reserved(self, sender: str) -> float:
+        """Get the amount a sender has committed to pending transactions"""
+        return self.reserved.get(sender, 0)
+
+    def get(self, tx_hash: str) -> Optional[dict]:
+        """Get a pending transaction by hash"""
+        entry = self.entries.get(tx_hash)
+        return entry.transaction if entry else None
+
+    def iter_by_priority(self) -> Iterator[MempoolEntry]:
+        """Yield entries by descending fee rate while keeping each sender's order.
+
+        Only the head of each sender queue competes on the heap, so a sender's
+        later transactions never overtake its earlier ones.
+        """
+        positions = {sender: 0 for sender in self.by_sender}
+        heap = []
+        for sender, queue in self.by_sender.items():
+            entry = self.entries[queue[0]]
+            heap.append((-entry.fee_rate, entry.sequence, sender))
+        heapq.heapify(heap)
+
+        while heap:
+            _, _, sender = heapq.heappop(heap)
+            queue = self.by_sender[sender]
+            yield self.entries[queue[positions[sender]]]
+
+            positions[sender] += 1
+            if positions[sender] < len(queue):
+                entry = self.entries[queue[positions[sender]]]
+                heapq.heappush(heap, (-entry.fee_rate, entry.sequence, sender))
+
+    def get_transactions(self, limit: Optional[int] = None) -> List[dict]:
+        """Get pending transactions in priority order"""
+        entries = self.iter_by_priority()
+        if limit is not None:
+            entries = itertools.islice(entries, limit)
+        return [entry.transaction for entry in entries]
+
+    @staticmethod
+    def _spend(transaction: dict) -> float:
+        return transaction["amount"] + transaction.get("fee", 0)
+
+    def _is_full(self, extra_bytes: int = 0) -> bool:
+        return (len(self.entries) >= self.max_transactions or
+                self.total_bytes + extra_bytes > self.max_bytes)
+
+    def _lowest_entry(self) -> Optional[MempoolEntry]:
+        """Peek at the cheapest live entry, discarding stale heap items"""
+        while self._eviction_heap:
+            tx_hash = self._eviction_heap[0][2]
+            if tx_hash in self.entries:
+                return self.entries[tx_hash]
+            heapq.heappop(self._eviction_heap)
+        return None
+
+    def _evict(self) -> None:
+        """Evict the lowest fee rate entries until the pool is within its caps"""
+        while len(self.entries) > self.max_transactions or self.total_bytes > self.max_bytes:
+            lowest = self._lowest_entry()
+            if lowest is None:
+                break
+            heapq.heappop(self._eviction_heap)
+
+            # Later nonces of the same sender could never be mined without it
+            queue = self.by_sender[lowest.transaction["from"]]
+            doomed = [lowest.tx_hash]
+            if "nonce" in lowest.transaction:
+                doomed = list(queue)[queue.index(lowest.tx_hash):]
+            for tx_hash in doomed:
+                self.remove(tx_hash)
@@ -0,0 +1,77 @@
+from typing import List, Tuple
+import hashlib
+
+EMPTY_ROOT = "0" * 64
+
+# Leaves and inner nodes hash under different prefixes, so an inner node can
+# never be passed off as a transaction
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+# Each proof step is the sibling hash and whether it sits on the left
+ProofStep = Tuple[str, bool]
+
+def _hash_leaf(tx_hash: str) -> str:
+    return hashlib.sha256(LEAF_PREFIX + bytes.fromhex(tx_hash)).hexdigest()
+
+def _hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+def _next_level(level: List[str]) -> List[str]:
+    parents = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])  # Odd levels carry the last node up unchanged
+    return parents
+
+def merkle_root(tx_hashes: List[str]) -> str:
+    """Compute the Merkle root of a list of hex transaction hashes"""
+    if not tx_hashes:
+        return EMPTY_ROOT
+
+    level = [_hash_leaf(tx_hash) for tx_hash in tx_hashes]
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+def merkle_proof(tx_hashes: List[str], index: int) -> List[ProofStep]:
+    """Build the O(log n) inclusion proof for the transaction at index"""
+    if not 0 <= index < len(tx_hashes):
+        raise IndexError("transaction index out of range")
+
+    proof = []
+    level = [_hash_leaf(tx_hash) for tx_hash in tx_hashes]
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append((level[sibling], sibling < index))
+        level = _next_level(level)
+        index //= 2
+    return proof
+
+def verify_merkle_proof(tx_hash: str, proof: List[ProofStep], root: str,
+                        index: int, leaf_count: int) -> bool:
+    """Check that a transaction hash sits at index of a tree of leaf_count committed to by root.
+
+    The shape of the path is derived from index and leaf_count, so a proof
+    for one position cannot be replayed for another.
+    """
+    if not 0 <= index < leaf_count:
+        return False
+    current = _hash_leaf(tx_hash)
+    steps = iter(proof)
+    width = leaf_count
+    while width > 1:
+        if index ^ 1 < width:
+            step = next(steps, None)
+            if step is None:
+                return False
+            sibling, sibling_is_left = step
+            if sibling_is_left != bool(index & 1):
+                return False
+            if sibling_is_left:
+                current = _hash_pair(sibling, current)
+            else:
+                current = _hash_pair(current, sibling)
+        index //= 2
+        width = (width + 1) // 2
+    return next(steps, None) is None and current == root
@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+import hashlib
+import multiprocessing
+import os
+import queue
+import time
+from .codec import encode_nonce
+
+NonceEncoder = Callable[[int], bytes]
+
+# How often the parent checks on its workers while waiting for results
+WORKER_POLL_INTERVAL = 0.1
+
+@dataclass
+class MiningResult:
+    nonce: int
+    hash: str
+    hashes: int
+    elapsed: float
+
+    @property
+    def hashrate(self) -> float:
+        """Hashes per second over the search"""
+        return self.hashes / self.elapsed if self.elapsed > 0 else 0
+
+def difficulty_target(difficulty: int) -> bytes:
+    """Exclusive upper bound for digests whose hex form starts with `difficulty` zeros"""
+    if difficulty <= 0:
+        return b"\xff" * 33  # Longer than any digest, so every digest sorts below it
+    return (1 << (256 - 4 * difficulty)).to_bytes(32, "big")
+
+def block_work(difficulty: int) -> int:
+    """Expected number of hashes needed to mine a block at this difficulty"""
+    return 1 << (4 * max(difficulty, 0))
+
+def ascii_nonce(nonce: int) -> bytes:
+    """Nonce encoding for string-built headers that end in the decimal nonce"""
+    return str(nonce).encode()
+
+def find_nonce(prefix: bytes,
+               difficulty: int,
+               start_nonce: int = 0,
+               step: int = 1,
+               max_hashes: Optional[int] = None,
+               nonce_encoder: NonceEncoder = encode_nonce) -> Optional[MiningResult]:
+    """Search for a nonce whose header hash meets the difficulty.
+
+    The header prefix is hashed once; every attempt copies that state and
+    feeds only the encoded nonce. Digests are compared as raw bytes against
+    the target, which is equivalent to checking for leading hex zeros.
+    Returns None if max_hashes attempts run out without a solution.
+    """
+    base = hashlib.sha256(prefix)
+    target = difficulty_target(difficulty)
+    nonce = start_nonce
+    hashes = 0
+    started = time.perf_counter()
+
+    while max_hashes is None or hashes < max_hashes:
+        candidate = base.copy()
+        candidate.update(nonce_encoder(nonce))
+        digest = candidate.digest()
+        hashes += 1
+        if digest < target:
+            return MiningResult(nonce, digest.hex(), hashes, time.perf_counter() - started)
+        nonce += step
+
+    return None
+
+def _search_worker(prefix: bytes, difficulty: int, start_nonce: int, step: int, chunk_size: int,
+                   nonce_encoder: NonceEncoder, found, results) -> None:
+    """Search one stride of the nonce space in chunks until any worker succeeds"""
+    nonce = start_nonce
+    hashes = 0
+    while not found.is_set():
+        result = find_nonce(prefix, difficulty, nonce, step, chunk_size, nonce_encoder)
+        if result:
+            found.set()
+            results.put((result.nonce, result.hash, hashes + result.hashes))
+            return
+        hashes += chunk_size
+        nonce += step * chunk_size
+    results.put((None, None, hashes))
+
+def find_nonce_parallel(prefix: bytes,
+                        difficulty: int,
+                        workers: Optional[int] = None,
+                        start_nonce: int = 0,
+                        chunk_size: int = 20000,
+                        nonce_encoder: NonceEncoder = encode_nonce) -> MiningResult:
+    """Split the nonce search across worker processes.
+
+    Worker i tries start_nonce + i, start_nonce + i + workers, ... and checks
+    a shared event between chunks, so every worker stops soon after the first
+    one finds a solution. The result reports hashes summed over all workers,
+    so its hashrate is the aggregate rate. Raises RuntimeError if a worker
+    dies before reporting, e.g. from an encoder error or being killed.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return find_nonce(prefix, difficulty, start_nonce, nonce_encoder=nonce_encoder)
+
+    context = multiprocessing.get_context()
+    found = context.Event()
+    results = context.Queue()
+    started = time.perf_counter()
+    processes = [
+        context.Process(
+            target=_search_worker,
+            args=(bytes(prefix), difficulty, start_nonce + i, workers, chunk_size,
+                  nonce_encoder, found, results),
+            daemon=True
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    solution = None
+    total_hashes = 0
+    reported = 0
+    try:
+        while reported < len(processes):
+            try:
+                nonce, hash_value, hashes = results.get(timeout=WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                failed = [process for process in processes if process.exitcode not in (None, 0)]
+                if failed and solution is None:
+                    raise RuntimeError(f"mining worker exited with code "
+                                       f"{failed[0].exitcode} before finding a nonce")
+                if failed:
+                    break
+                continue
+            reported += 1
+            total_hashes += hashes
+            if nonce is not None and solution is None:
+                solution = (nonce, hash_value)
+    finally:
+        found.set()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    if solution is None:
+        raise RuntimeError("no mining worker found a nonce")
+    return MiningResult(solution[0], solution[1], total_hashes, time.perf_counter() - started)
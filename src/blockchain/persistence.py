@@ -0,0 +1,200 @@
+import csv
+import io
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, delete, func, insert, literal, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from src.models import Account, Block, Transaction
+
+BLOCK_COLUMNS = ("hash", "previous_hash", "timestamp", "nonce", "difficulty")
+TRANSACTION_COLUMNS = ("hash", "from_address", "to_address", "amount", "timestamp", "block_id")
+
+class BlockWriter:
+    """Persists blocks and their transactions with bulk statements instead of the ORM.
+
+    Blocks are buffered and written blocks_per_commit at a time: one
+    multi-row INSERT ... RETURNING for the blocks, then every transaction of
+    the batch in a single executemany, or COPY on PostgreSQL with psycopg2,
+    then one upsert of the accounts the batch touched, all in one database
+    transaction so balances never disagree with the stored blocks.
+    """
+
+    def __init__(self, db: Session, blocks_per_commit: int = 1,
+                 on_commit: Optional[Callable[[List[Block]], None]] = None):
+        self.db = db
+        self.blocks_per_commit = blocks_per_commit
+        self.on_commit = on_commit
+        self.pending: List[Block] = []
+
+    def add(self, block: Block) -> None:
+        """Buffer a block, writing the batch once it is full"""
+        self.pending.append(block)
+        if len(self.pending) >= self.blocks_per_commit:
+            self.flush()
+
+    def add_many(self, blocks: List[Block]) -> None:
+        for block in blocks:
+            self.add(block)
+
+    def find_pending(self, block_hash: str) -> Optional[Block]:
+        """Find a buffered block that has not been written yet"""
+        for block in reversed(self.pending):
+            if block.hash == block_hash:
+                return block
+        return None
+
+    def flush(self) -> None:
+        """Write and commit every buffered block, rolling back on failure"""
+        if not self.pending:
+            return
+        blocks, self.pending = self.pending, []
+        try:
+            self._write(blocks)
+            self.db.commit()
+        except BaseException:
+            self.db.rollback()
+            raise
+        if self.on_commit is not None:
+            self.on_commit(blocks)
+
+    def _write(self, blocks: List[Block]) -> None:
+        block_table = Block.__table__
+        rows = [{column: getattr(block, column) for column in BLOCK_COLUMNS} for block in blocks]
+        result = self.db.execute(
+            insert(block_table).values(rows).returning(block_table.c.id, block_table.c.hash)
+        )
+        block_ids: Dict[str, int] = {block_hash: block_id for block_id, block_hash in result}
+
+        transaction_rows = []
+        for block in blocks:
+            block.id = block_ids[block.hash]
+            for tx in block.transactions:
+                row = {column: getattr(tx, column) for column in TRANSACTION_COLUMNS}
+                row["block_id"] = block.id
+                # Column defaults only fire for omitted keys, not explicit None
+                if row["timestamp"] is None:
+                    row["timestamp"] = datetime.utcnow()
+                transaction_rows.append(row)
+        if not transaction_rows:
+            return
+
+        if self._can_copy():
+            self._copy_transactions(transaction_rows)
+        else:
+            self.db.execute(insert(Transaction.__table__), transaction_rows)
+        upsert_accounts(self.db, account_deltas(transaction_rows))
+
+    def _can_copy(self) -> bool:
+        dialect = self.db.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+    def _copy_transactions(self, rows: List[Dict]) -> None:
+        """Stream transaction rows through COPY FROM STDIN on the session's connection"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row[column] for column in TRANSACTION_COLUMNS])
+        buffer.seek(0)
+
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY transactions ({', '.join(TRANSACTION_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+def account_deltas(transactions: List[Dict]) -> Dict[str, Tuple[float, int]]:
+    """Net (balance change, sent count) per address over a batch of transaction rows"""
+    deltas: Dict[str, Tuple[float, int]] = {}
+    for tx in transactions:
+        balance, sent = deltas.get(tx["from_address"], (0.0, 0))
+        deltas[tx["from_address"]] = (balance - tx["amount"], sent + 1)
+        balance, sent = deltas.get(tx["to_address"], (0.0, 0))
+        deltas[tx["to_address"]] = (balance + tx["amount"], sent)
+    return deltas
+
+def upsert_accounts(db: Session, deltas: Dict[str, Tuple[float, int]]) -> None:
+    """Add balance and nonce deltas to account rows, creating missing ones.
+
+    One INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite; elsewhere
+    an executemany UPDATE of existing rows plus an INSERT of new ones.
+    """
+    if not deltas:
+        return
+    accounts = Account.__table__
+    now = datetime.utcnow()
+    rows = [
+        {"address": address, "balance": balance, "nonce": sent, "created_at": now}
+        for address, (balance, sent) in deltas.items()
+    ]
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = dialect_insert(accounts).values(rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[accounts.c.address],
+            set_={
+                "balance": func.coalesce(accounts.c.balance, 0) + statement.excluded.balance,
+                "nonce": func.coalesce(accounts.c.nonce, 0) + statement.excluded.nonce,
+            }
+        ))
+        return
+
+    existing = set(db.execute(
+        select(accounts.c.address).where(accounts.c.address.in_(list(deltas)))
+    ).scalars())
+    updates = [
+        {"target": row["address"], "delta_balance": row["balance"], "delta_nonce": row["nonce"]}
+        for row in rows if row["address"] in existing
+    ]
+    if updates:
+        db.execute(
+            update(accounts)
+            .where(accounts.c.address == bindparam("target"))
+            .values(balance=func.coalesce(accounts.c.balance, 0) + bindparam("delta_balance"),
+                    nonce=func.coalesce(accounts.c.nonce, 0) + bindparam("delta_nonce")),
+            updates
+        )
+    inserts = [row for row in rows if row["address"] not in existing]
+    if inserts:
+        db.execute(insert(accounts), inserts)
+
+def reconcile_accounts(db: Session) -> int:
+    """Rebuild the accounts table from the transaction history, returning the account count.
+
+    Runs as one set-based INSERT ... SELECT inside a single transaction, so
+    readers see either the old table or the rebuilt one.
+    """
+    transactions = Transaction.__table__
+    accounts = Account.__table__
+    movements = union_all(
+        select(transactions.c.to_address.label("address"),
+               transactions.c.amount.label("delta"),
+               literal(0).label("sent")),
+        select(transactions.c.from_address.label("address"),
+               (-transactions.c.amount).label("delta"),
+               literal(1).label("sent")),
+    ).subquery()
+    totals = select(
+        movements.c.address,
+        func.sum(movements.c.delta),
+        func.sum(movements.c.sent),
+        literal(datetime.utcnow()),
+    ).group_by(movements.c.address)
+
+    try:
+        db.execute(delete(accounts))
+        db.execute(insert(accounts).from_select(
+            ["address", "balance", "nonce", "created_at"], totals
+        ))
+        count = db.execute(select(func.count()).select_from(accounts)).scalar_one()
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    return count
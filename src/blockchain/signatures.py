@@ -0,0 +1,80 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+import os
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+        Ed25519PrivateKey,
+        Ed25519PublicKey,
+    )
+except ImportError:  # Signing is unavailable until 'cryptography' is installed
+    Ed25519PrivateKey = None
+
+# (public key hex, signed message, signature hex)
+SignatureCheck = Tuple[str, bytes, str]
+
+# Below this many checks the pool costs more than it saves
+MIN_PARALLEL_BATCH = 64
+
+def _require_backend() -> None:
+    if Ed25519PrivateKey is None:
+        raise RuntimeError("Ed25519 signatures require the 'cryptography' package")
+
+def generate_keypair() -> Tuple[str, str]:
+    """Create an Ed25519 key pair as (private key hex, public key hex)"""
+    _require_backend()
+    private_key = Ed25519PrivateKey.generate()
+    return private_key.private_bytes_raw().hex(), private_key.public_key().public_bytes_raw().hex()
+
+def public_key_for(private_key: str) -> str:
+    _require_backend()
+    key = Ed25519PrivateKey.from_private_bytes(bytes.fromhex(private_key))
+    return key.public_key().public_bytes_raw().hex()
+
+def sign_message(private_key: str, message: bytes) -> str:
+    _require_backend()
+    return Ed25519PrivateKey.from_private_bytes(bytes.fromhex(private_key)).sign(message).hex()
+
+def verify_signature(public_key: str, message: bytes, signature: str) -> bool:
+    """Check an Ed25519 signature; malformed keys or signatures simply fail"""
+    _require_backend()
+    try:
+        key = Ed25519PublicKey.from_public_bytes(bytes.fromhex(public_key))
+        key.verify(bytes.fromhex(signature), message)
+    except (InvalidSignature, ValueError, TypeError):
+        return False
+    return True
+
+def _verify_chunk(checks: Sequence[SignatureCheck]) -> List[bool]:
+    return [
+        verify_signature(public_key, message, signature)
+        for public_key, message, signature in checks
+    ]
+
+def verify_batch(checks: Sequence[SignatureCheck],
+                 workers: Optional[int] = None,
+                 processes: bool = False,
+                 executor: Optional[Executor] = None) -> List[bool]:
+    """Verify many signatures, split into one chunk per worker.
+
+    Runs on a thread pool by default, or a process pool with processes=True;
+    pass an executor to reuse a long-lived pool. Small batches are checked
+    inline. Results are in the order of the checks.
+    """
+    checks = list(checks)
+    if not checks:
+        return []
+    _require_backend()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(checks) < MIN_PARALLEL_BATCH:
+        return _verify_chunk(checks)
+
+    chunk_size = -(-len(checks) // workers)
+    chunks = [checks[start:start + chunk_size] for start in range(0, len(checks), chunk_size)]
+    if executor is not None:
+        return [valid for result in executor.map(_verify_chunk, chunks) for valid in result]
+
+    pool_type = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_type(max_workers=workers) as pool:
+        return [valid for result in pool.map(_verify_chunk, chunks) for valid in result]
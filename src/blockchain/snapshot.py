@@ -0,0 +1,193 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import json
+import os
+import tempfile
+from .ledger import BalanceLedger
+from .stats import ChainStats
+from ..consensus.pos import ProofOfStake, Validator
+from ..governance.governance import Governance, Proposal, ProposalStatus, ProposalType
+from ..staking.staking_pool import StakingPool
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Cannot snapshot value of type {type(value).__name__}")
+
+def _decode_value(value: Dict) -> Any:
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+@dataclass
+class Snapshot:
+    height: int
+    block_hash: str
+    balances: Dict[str, float]
+    nonces: Optional[Dict[str, int]] = None
+    pos: Optional[Dict] = None
+    staking: Optional[Dict] = None
+    governance: Optional[Dict] = None
+    stats: Optional[Dict] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+def export_pos(pos: ProofOfStake) -> Dict:
+    return {
+        "minimum_stake": pos.minimum_stake,
+        "total_stake": pos.total_stake,
+        "last_block_validators": list(pos.last_block_validators),
+        "validators": {
+            address: {
+                "stake": validator.stake,
+                "is_active": validator.is_active,
+                "last_block_time": validator.last_block_time,
+                "reputation": validator.reputation
+            }
+            for address, validator in pos.validators.items()
+        }
+    }
+
+def restore_pos(pos: ProofOfStake, state: Dict) -> None:
+    pos.minimum_stake = state["minimum_stake"]
+    pos.total_stake = state["total_stake"]
+    pos.last_block_validators = list(state["last_block_validators"])
+    pos.validators = {}
+    for address, data in state["validators"].items():
+        validator = Validator(address, data["stake"])
+        validator.is_active = data["is_active"]
+        validator.last_block_time = data["last_block_time"]
+        validator.reputation = data["reputation"]
+        pos.validators[address] = validator
+
+def export_staking(staking: StakingPool) -> Dict:
+    return {
+        "total_staked": staking.total_staked,
+        "stakers": staking.stakers
+    }
+
+def restore_staking(staking: StakingPool, state: Dict) -> None:
+    staking.total_staked = state["total_staked"]
+    staking.stakers = state["stakers"]
+
+def export_governance(governance: Governance) -> Dict:
+    return {
+        "next_proposal_id": governance.next_proposal_id,
+        "treasury_balance": governance.treasury_balance,
+        "protocol_parameters": governance.protocol_parameters,
+        "proposals": [proposal.to_dict() for proposal in governance.proposals.values()]
+    }
+
+def restore_governance(governance: Governance, state: Dict) -> None:
+    governance.next_proposal_id = state["next_proposal_id"]
+    governance.treasury_balance = state["treasury_balance"]
+    governance.protocol_parameters = state["protocol_parameters"]
+    governance.proposals = {}
+    for data in state["proposals"]:
+        proposal = Proposal(
+            id=data["id"],
+            title=data["title"],
+            description=data["description"],
+            proposer=data["proposer"],
+            proposal_type=ProposalType(data["proposal_type"]),
+            parameters=data["parameters"],
+            required_quorum=data["required_quorum"]
+        )
+        proposal.creation_time = datetime.fromisoformat(data["creation_time"])
+        proposal.end_time = datetime.fromisoformat(data["end_time"])
+        proposal.status = ProposalStatus(data["status"])
+        proposal.votes_for = data["votes_for"]
+        proposal.votes_against = data["votes_against"]
+        proposal.votes_abstain = data["votes_abstain"]
+        if data["execution_time"]:
+            proposal.execution_time = datetime.fromisoformat(data["execution_time"])
+        proposal.execution_data = data["execution_data"]
+        proposal.comments = data["comments"]
+        proposal.updates = data["updates"]
+        governance.proposals[proposal.id] = proposal
+
+class SnapshotManager:
+    """Writes periodic state snapshots and loads the latest one on startup.
+
+    A snapshot records balances and nonces as of a block height, plus the validator
+    set, staking pool and governance proposals attached to the manager, so
+    a restarting node only replays blocks above that height.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 interval: int = 1000,
+                 keep: int = 2,
+                 staking_pool: Optional[StakingPool] = None,
+                 governance: Optional[Governance] = None):
+        self.directory = directory
+        self.interval = interval
+        self.keep = keep
+        self.staking_pool = staking_pool
+        self.governance = governance
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, height: int) -> str:
+        return os.path.join(self.directory, f"snapshot_{height:012d}.json")
+
+    def list_heights(self) -> List[int]:
+        heights = []
+        for name in os.listdir(self.directory):
+            if name.startswith("snapshot_") and name.endswith(".json"):
+                heights.append(int(name[len("snapshot_"):-len(".json")]))
+        return sorted(heights)
+
+    def should_snapshot(self, height: int) -> bool:
+        return self.interval > 0 and height > 0 and height % self.interval == 0
+
+    def write(self, height: int, block_hash: str, ledger: BalanceLedger,
+              pos: Optional[ProofOfStake] = None, stats: Optional[ChainStats] = None) -> str:
+        """Write a snapshot atomically: to a temp file first, then renamed into place"""
+        snapshot = Snapshot(
+            height=height,
+            block_hash=block_hash,
+            balances=dict(ledger.balances),
+            nonces=dict(ledger.nonces),
+            pos=export_pos(pos) if pos else None,
+            staking=export_staking(self.staking_pool) if self.staking_pool else None,
+            governance=export_governance(self.governance) if self.governance else None,
+            stats=stats.export_state() if stats else None
+        )
+
+        path = self._path(height)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as temp_file:
+                json.dump(snapshot.__dict__, temp_file, default=_encode_value)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        for old_height in self.list_heights()[:-self.keep]:
+            os.unlink(self._path(old_height))
+        return path
+
+    def load_latest(self) -> Optional[Snapshot]:
+        """Load the most recent snapshot, or None if there is none"""
+        heights = self.list_heights()
+        if not heights:
+            return None
+        with open(self._path(heights[-1])) as snapshot_file:
+            return Snapshot(**json.load(snapshot_file, object_hook=_decode_value))
+
+    def restore(self, snapshot: Snapshot, ledger: BalanceLedger,
+                pos: Optional[ProofOfStake] = None, stats: Optional[ChainStats] = None) -> None:
+        """Load snapshot state into the ledger and attached components"""
+        ledger.balances = dict(snapshot.balances)
+        ledger.nonces = dict(snapshot.nonces or {})
+        if stats is not None and snapshot.stats is not None:
+            stats.restore_state(snapshot.stats)
+        if pos is not None and snapshot.pos is not None:
+            restore_pos(pos, snapshot.pos)
+        if self.staking_pool is not None and snapshot.staking is not None:
+            restore_staking(self.staking_pool, snapshot.staking)
+        if self.governance is not None and snapshot.governance is not None:
+            restore_governance(self.governance, snapshot.governance)
@@ -0,0 +1,108 @@
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Iterable, Optional, Union
+
+def _seconds(timestamp: Union[datetime, float]) -> float:
+    return timestamp.timestamp() if isinstance(timestamp, datetime) else timestamp
+
+class ChainStats:
+    """Running chain aggregates, updated per block instead of recomputed per query.
+
+    Keeps lifetime totals plus the same figures over the last `window` blocks.
+    """
+
+    def __init__(self, window: int = 100):
+        self.window = window
+        self.total_blocks = 0
+        self.total_transactions = 0
+        self.cumulative_block_time = 0.0
+        self.min_block_interval: Optional[float] = None
+        self.max_block_interval: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self._recent_intervals: Deque[float] = deque()
+        self._recent_transactions: Deque[int] = deque()
+        self._recent_interval_sum = 0.0
+        self._recent_transaction_sum = 0
+
+    def add_block(self, block) -> None:
+        transactions = len(block.transactions)
+        self.total_blocks += 1
+        self.total_transactions += transactions
+        self._recent_transactions.append(transactions)
+        self._recent_transaction_sum += transactions
+        if len(self._recent_transactions) > self.window:
+            self._recent_transaction_sum -= self._recent_transactions.popleft()
+
+        timestamp = _seconds(block.timestamp)
+        if self.last_timestamp is not None:
+            interval = timestamp - self.last_timestamp
+            self.cumulative_block_time += interval
+            if self.min_block_interval is None or interval < self.min_block_interval:
+                self.min_block_interval = interval
+            if self.max_block_interval is None or interval > self.max_block_interval:
+                self.max_block_interval = interval
+
+            self._recent_intervals.append(interval)
+            self._recent_interval_sum += interval
+            if len(self._recent_intervals) > self.window:
+                self._recent_interval_sum -= self._recent_intervals.popleft()
+        self.last_timestamp = timestamp
+
+    def rebuild(self, chain: Iterable) -> None:
+        self.__init__(self.window)
+        for block in chain:
+            self.add_block(block)
+
+    @property
+    def average_block_time(self) -> float:
+        if self.total_blocks < 2:
+            return 0
+        return self.cumulative_block_time / (self.total_blocks - 1)
+
+    def to_dict(self) -> Dict:
+        """Lifetime and windowed statistics"""
+        recent_blocks = len(self._recent_transactions)
+        return {
+            "total_blocks": self.total_blocks,
+            "total_transactions": self.total_transactions,
+            "average_block_time": self.average_block_time,
+            "min_block_interval": self.min_block_interval,
+            "max_block_interval": self.max_block_interval,
+            "window": {
+                "blocks": recent_blocks,
+                "transactions": self._recent_transaction_sum,
+                "average_block_time": (self._recent_interval_sum / len(self._recent_intervals)
+                                       if self._recent_intervals else 0),
+                "min_block_interval": min(self._recent_intervals, default=None),
+                "max_block_interval": max(self._recent_intervals, default=None),
+                "transactions_per_block": (
+                    self._recent_transaction_sum / recent_blocks if recent_blocks else 0
+                )
+            }
+        }
+
+    def export_state(self) -> Dict:
+        return {
+            "window": self.window,
+            "total_blocks": self.total_blocks,
+            "total_transactions": self.total_transactions,
+            "cumulative_block_time": self.cumulative_block_time,
+            "min_block_interval": self.min_block_interval,
+            "max_block_interval": self.max_block_interval,
+            "last_timestamp": self.last_timestamp,
+            "recent_intervals": list(self._recent_intervals),
+            "recent_transactions": list(self._recent_transactions)
+        }
+
+    def restore_state(self, state: Dict) -> None:
+        self.__init__(state["window"])
+        self.total_blocks = state["total_blocks"]
+        self.total_transactions = state["total_transactions"]
+        self.cumulative_block_time = state["cumulative_block_time"]
+        self.min_block_interval = state["min_block_interval"]
+        self.max_block_interval = state["max_block_interval"]
+        self.last_timestamp = state["last_timestamp"]
+        self._recent_intervals = deque(state["recent_intervals"])
+        self._recent_transactions = deque(state["recent_transactions"])
+        self._recent_interval_sum = sum(self._recent_intervals)
+        self._recent_transaction_sum = sum(self._recent_transactions)
@@ -1,7 +1,51 @@
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import datetime
 import hashlib
-from typing import Optional
+from typing import Iterable, List, Optional
+from .codec import encode, encode_transaction
+from .signatures import SignatureCheck, sign_message, verify_batch, verify_signature
+
+def serialize_transaction(transaction: dict) -> memoryview:
+    """Serialize a transaction dict with the canonical binary codec"""
+    return encode_transaction(transaction)
+
+def transaction_hash(transaction: dict) -> str:
+    """Hash a transaction dict over its canonical serialization"""
+    return hashlib.sha256(serialize_transaction(transaction)).hexdigest()
+
+def signing_payload(transaction: dict) -> bytes:
+    """What a transaction dict's signature covers: its hash without the signature field"""
+    unsigned = {key: value for key, value in transaction.items() if key != "signature"}
+    return bytes.fromhex(transaction_hash(unsigned))
+
+def sign_transaction(transaction: dict, private_key: str) -> dict:
+    """Sign a transaction dict in place; the sender must be the signer's public key"""
+    transaction["signature"] = sign_message(private_key, signing_payload(transaction))
+    return transaction
+
+def signature_check(transaction, network_address: str = "network") -> Optional[SignatureCheck]:
+    """The check a transaction needs, or None for reward transactions that carry no signature"""
+    if isinstance(transaction, dict):
+        if transaction["from"] == network_address:
+            return None
+        return transaction["from"], signing_payload(transaction), transaction.get("signature") or ""
+    if transaction.sender == "0":
+        return None
+    message = bytes.fromhex(transaction.calculate_hash())
+    return transaction.sender, message, transaction.signature or ""
+
+def verify_transactions(transactions: Iterable,
+                        workers: Optional[int] = None,
+                        processes: bool = False,
+                        executor: Optional[Executor] = None,
+                        network_address: str = "network") -> List[bool]:
+    """Verify the signatures of a block's or mempool batch's transactions in one batch"""
+    transactions = list(transactions)
+    checks = [signature_check(tx, network_address) for tx in transactions]
+    signed = [check for check in checks if check is not None]
+    results = iter(verify_batch(signed, workers, processes, executor))
+    return [True if check is None else next(results) for check in checks]
 
 @dataclass
 class Transaction:
@@ -12,18 +56,16 @@ class Transaction:
     signature: Optional[str] = None
     
     def calculate_hash(self) -> str:
-        transaction_string = f"{self.sender}{self.recipient}{self.amount}{self.timestamp}"
-        return hashlib.sha256(transaction_string.encode()).hexdigest()
+        transaction_bytes = encode([self.sender, self.recipient, self.amount, self.timestamp])
+        return hashlib.sha256(transaction_bytes).hexdigest()
     
     def sign(self, private_key: str) -> None:
-        # Implement actual signature logic here
-        self.signature = hashlib.sha256(
-            (self.calculate_hash() + private_key).encode()
-        ).hexdigest()
+        """Sign the transaction hash with Ed25519; the sender is the signer's public key"""
+        self.signature = sign_message(private_key, bytes.fromhex(self.calculate_hash()))
     
     def is_valid(self) -> bool:
         if self.sender == "0":
             return True  # Mining reward
         if not self.signature:
             return False
-        return True  # Add actual signature verification
\ No newline at end of file
+        return verify_signature(self.sender, bytes.fromhex(self.calculate_hash()), self.signature)
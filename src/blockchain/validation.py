@@ -0,0 +1,150 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import os
+from .ledger import BalanceLedger
+
+@dataclass
+class ValidationResult:
+    is_valid: bool
+    invalid_height: Optional[int] = None
+    reason: Optional[str] = None
+
+Failure = Tuple[int, str]
+
+def _check_block_hash(block) -> Optional[str]:
+    """Return a failure reason if the block hash or its Merkle commitment is wrong"""
+    if block.hash != block.calculate_hash():
+        return "hash mismatch"
+    # Pruned headers have no body left to check the root against
+    if not block.is_pruned and not block.has_valid_merkle_root():
+        return "merkle root mismatch"
+    return None
+
+def _check_block_structure(block, previous_block) -> Optional[str]:
+    """Return a failure reason if the block hash or its link to the parent is wrong"""
+    # Verify current block hash
+    reason = _check_block_hash(block)
+    if reason:
+        return reason
+
+    # Verify block link
+    if block.previous_hash != previous_block.hash:
+        return "broken link to previous block"
+
+    return None
+
+def verify_segment(start_height: int, blocks: List) -> Optional[Failure]:
+    """Verify hashes and internal links of a contiguous run of blocks.
+
+    The link from the first block to its parent lives outside the segment and
+    is checked by the caller when the segments are stitched back together.
+    """
+    for offset, block in enumerate(blocks):
+        height = start_height + offset
+        if height == 0:  # Genesis is trusted as-is
+            continue
+        reason = _check_block_hash(block)
+        if reason:
+            return height, reason
+        if offset > 0 and block.previous_hash != blocks[offset - 1].hash:
+            return height, "broken link to previous block"
+    return None
+
+def verify_structure_parallel(chain: List, workers: Optional[int] = None) -> Optional[Failure]:
+    """Verify block hashes and links on a process pool, returning the first failure"""
+    workers = workers or os.cpu_count() or 1
+    segment_length = max(1, -(-len(chain) // workers))
+    starts = list(range(0, len(chain), segment_length))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(verify_segment, start, chain[start:start + segment_length])
+            for start in starts
+        ]
+        failures = [future.result() for future in futures]
+
+    # Stitch the segments together by checking the links across boundaries
+    for start in starts[1:]:
+        if chain[start].previous_hash != chain[start - 1].hash:
+            failures.append((start, "broken link to previous block"))
+
+    return min((failure for failure in failures if failure),
+               key=lambda failure: failure[0], default=None)
+
+class ChainValidator:
+    """Validates a chain by replaying its blocks once, in order"""
+
+    def __init__(self, network_address: str = "network", parallel: bool = False,
+                 workers: Optional[int] = None):
+        self.network_address = network_address
+        self.parallel = parallel
+        self.workers = workers
+
+    def validate(self, chain: List,
+                 base_ledger: Optional[BalanceLedger] = None) -> ValidationResult:
+        """Check hashes, links and sender solvency, stopping at the first invalid block.
+
+        Pruned blocks only get hash and link checks; the balance replay starts
+        from base_ledger, the balances as of the last pruned block.
+        """
+        if not chain:
+            return ValidationResult(True)
+
+        # Hash and link checks are independent across blocks, so they can run
+        # on the pool up front; the balance replay below stays sequential.
+        structural_failure = None
+        if self.parallel and len(chain) > 1:
+            structural_failure = verify_structure_parallel(chain, self.workers)
+
+        ledger = base_ledger.copy() if base_ledger is not None else BalanceLedger()
+        if not chain[0].is_pruned:
+            ledger.apply_block(chain[0])
+
+        for height in range(1, len(chain)):
+            current_block = chain[height]
+
+            if structural_failure and structural_failure[0] == height:
+                return ValidationResult(False, height, structural_failure[1])
+
+            if not self.parallel:
+                reason = _check_block_structure(current_block, chain[height - 1])
+                if reason:
+                    return ValidationResult(False, height, reason)
+
+            if current_block.is_pruned:
+                continue
+
+            # Verify every sender could afford its spends as of this block
+            reason = (self._check_nonces(ledger, current_block.transactions) or
+                      self._check_solvency(ledger, current_block.transactions))
+            if reason:
+                return ValidationResult(False, height, reason)
+
+            ledger.apply_block(current_block)
+
+        return ValidationResult(True)
+
+    def _check_nonces(self, ledger: BalanceLedger, transactions: List[dict]) -> Optional[str]:
+        """Return a failure reason if a sender's nonces do not continue from its account state"""
+        expected: Dict[str, int] = {}
+        for tx in transactions:
+            if "nonce" not in tx:  # Transactions from before nonces existed
+                continue
+            sender = tx["from"]
+            if tx["nonce"] != expected.get(sender, ledger.get_nonce(sender)):
+                return f"unexpected nonce for {sender}"
+            expected[sender] = tx["nonce"] + 1
+        return None
+
+    def _check_solvency(self, ledger: BalanceLedger, transactions: List[dict]) -> Optional[str]:
+        """Return a failure reason if a sender overspends its balance before the block"""
+        spent: Dict[str, float] = {}
+        for tx in transactions:
+            sender = tx["from"]
+            if sender == self.network_address:  # Skip reward transactions
+                continue
+            spent[sender] = spent.get(sender, 0) + tx["amount"] + tx.get("fee", 0)
+            if ledger.get_balance(sender) < spent[sender]:
+                return f"insufficient balance for {sender}"
+        return None
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Table, Index
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 
@@ -9,7 +9,7 @@ class Block(Base):
     
     id = Column(Integer, primary_key=True)
     hash = Column(String, unique=True, nullable=False)
-    previous_hash = Column(String, nullable=False)
+    previous_hash = Column(String, nullable=False, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
     nonce = Column(Integer, nullable=False)
     difficulty = Column(Integer, nullable=False)
@@ -24,9 +24,15 @@ class Transaction(Base):
     to_address = Column(String, nullable=False)
     amount = Column(Float, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    block_id = Column(Integer, ForeignKey('blocks.id'))
+    block_id = Column(Integer, ForeignKey('blocks.id'), index=True)
     block = relationship('Block', back_populates='transactions')
 
+    # Address history: filter by either side, ordered by block
+    __table_args__ = (
+        Index('ix_transactions_from_address_block_id', 'from_address', 'block_id'),
+        Index('ix_transactions_to_address_block_id', 'to_address', 'block_id'),
+    )
+
 class Account(Base):
     __tablename__ = 'accounts'
     
@@ -2,6 +2,7 @@ from typing import Dict, List, Optional
 from decimal import Decimal
 import time
 import hashlib
+from ..blockchain.codec import encode
 
 class StateChannel:
     def __init__(self, participant1: str, participant2: str):
@@ -42,5 +43,6 @@ class PlasmaChain:
         return block['hash']
 
     def _calculate_block_hash(self, block: Dict) -> str:
-        block_string = f"{block['transactions']}{block['timestamp']}{block['operator']}{block['previous_hash']}"
-        return hashlib.sha256(block_string.encode()).hexdigest()
\ No newline at end of file
+        block_bytes = encode([block['transactions'], block['timestamp'], block['operator'],
+                              block['previous_hash']])
+        return hashlib.sha256(block_bytes).hexdigest()
\ No newline at end of file
@@ -5,12 +5,13 @@ from blockchain.blockchain import Blockchain
 from consensus.pos import ProofOfStake
 from staking.staking_pool import StakingPool
 from governance.governance import Governance
+from monitoring.metrics_collector import MetricsCollector
 
 def create_app():
     app = Flask(__name__)
 
     # Initialize components
-    blockchain = Blockchain()
+    blockchain = Blockchain(metrics=MetricsCollector())
     pos = ProofOfStake()
     staking_pool = StakingPool()
     governance = Governance()
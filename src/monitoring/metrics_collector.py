@@ -23,6 +23,14 @@ class MetricsCollector:
             'block_size_bytes',
             'Size of the last block'
         )
+        self.block_fill_ratio_gauge = Gauge(
+            'block_fill_ratio',
+            'Fraction of block capacity used by the last block'
+        )
+        self.block_fees_gauge = Gauge(
+            'block_fees_total',
+            'Transaction fees collected in the last block'
+        )
         
         # Network metrics
         self.peer_count_gauge = Gauge(
@@ -50,4 +58,8 @@ class MetricsCollector:
 
     def update_block_metrics(self, time_seconds: float, size_bytes: int):
         self.block_time_gauge.set(time_seconds)
-        self.block_size_gauge.set(size_bytes)
\ No newline at end of file
+        self.block_size_gauge.set(size_bytes)
+
+    def update_block_template_metrics(self, fill_ratio: float, fees: float):
+        self.block_fill_ratio_gauge.set(fill_ratio)
+        self.block_fees_gauge.set(fees)
\ No newline at end of file
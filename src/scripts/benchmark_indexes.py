@@ -0,0 +1,117 @@
+from sqlalchemy import create_engine, insert, text
+import random
+import sys
+import os
+import time
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.models import Base, Block, Transaction
+
+# Point this at a scratch database: the tables are dropped and recreated
+DATABASE_URL = os.getenv('BENCHMARK_DATABASE_URL', 'sqlite://')
+BLOCKS = int(os.getenv('BENCHMARK_BLOCKS', '2000'))
+TRANSACTIONS_PER_BLOCK = int(os.getenv('BENCHMARK_TRANSACTIONS_PER_BLOCK', '50'))
+ADDRESSES = 5000
+REPEATS = 20
+
+QUERIES = {
+    "address history": (
+        "SELECT id, block_id, amount FROM transactions "
+        "WHERE from_address = :address OR to_address = :address ORDER BY block_id",
+        {"address": "addr42"}
+    ),
+    "address balance": (
+        "SELECT (SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE to_address = :address) - "
+        "(SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE from_address = :address)",
+        {"address": "addr42"}
+    ),
+    "block transactions": (
+        "SELECT id, amount FROM transactions WHERE block_id = :block_id",
+        {"block_id": BLOCKS // 2}
+    ),
+    "parent lookup": (
+        "SELECT id FROM blocks WHERE previous_hash = :previous_hash",
+        {"previous_hash": f"{BLOCKS // 2:064x}"}
+    ),
+}
+
+# Indexes added by the add_query_indexes migration
+NEW_INDEXES = [
+    index
+    for table in (Block.__table__, Transaction.__table__)
+    for index in table.indexes
+    if index.name in ('ix_blocks_previous_hash', 'ix_transactions_block_id',
+                      'ix_transactions_from_address_block_id',
+                      'ix_transactions_to_address_block_id')
+]
+
+def populate(connection):
+    random.seed(0)
+    blocks = [
+        {"id": height + 1, "hash": f"{height + 1:064x}", "previous_hash": f"{height:064x}",
+         "nonce": 0, "difficulty": 4}
+        for height in range(BLOCKS)
+    ]
+    connection.execute(insert(Block.__table__), blocks)
+
+    transactions = [
+        {"hash": f"tx{block_id}_{position}",
+         "from_address": f"addr{random.randrange(ADDRESSES)}",
+         "to_address": f"addr{random.randrange(ADDRESSES)}",
+         "amount": random.random() * 100,
+         "block_id": block_id}
+        for block_id in range(1, BLOCKS + 1)
+        for position in range(TRANSACTIONS_PER_BLOCK)
+    ]
+    connection.execute(insert(Transaction.__table__), transactions)
+
+def explain(connection, sql, params):
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(text(f"EXPLAIN ANALYZE {sql}"), params)
+        return [row[0] for row in rows]
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params)
+    return [row[-1] for row in rows]
+
+def timed(connection, sql, params):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        connection.execute(text(sql), params).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_queries(connection, label):
+    print(f"\n=== {label} ===")
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        results[name] = timed(connection, sql, params)
+        print(f"\n{name}: {results[name] * 1000:.3f} ms (best of {REPEATS})")
+        for line in explain(connection, sql, params):
+            print(f"  {line}")
+    return results
+
+def benchmark():
+    engine = create_engine(DATABASE_URL)
+    with engine.begin() as connection:
+        Base.metadata.drop_all(connection)
+        Base.metadata.create_all(connection)
+        for index in NEW_INDEXES:
+            index.drop(connection)
+        print(f"Populating {BLOCKS} blocks with {TRANSACTIONS_PER_BLOCK} transactions each...")
+        populate(connection)
+        connection.execute(text("ANALYZE"))
+        before = run_queries(connection, "Without indexes")
+
+        for index in NEW_INDEXES:
+            index.create(connection)
+        connection.execute(text("ANALYZE"))
+        after = run_queries(connection, "With indexes")
+
+    print("\n=== Summary ===")
+    for name in QUERIES:
+        print(f"{name}: {before[name] * 1000:.3f} ms -> {after[name] * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    benchmark()
@@ -40,8 +40,7 @@ def test_blockchain():
         print(f"Block is valid: {is_valid}")
         
         if is_valid:
-            session.add(new_block)
-            session.commit()
+            blockchain.save_block(new_block)
             print("\nBlock added to the blockchain!")
             print(f"Block hash: {new_block.hash}")
             print(f"Nonce: {new_block.nonce}")
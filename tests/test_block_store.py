@@ -0,0 +1,136 @@
+import pytest
+from datetime import datetime
+from src.blockchain.block import Block
+from src.blockchain.block_store import BlockStore
+from src.blockchain.blockchain import Blockchain
+
+def make_chain(length):
+    blocks = [Block(0, datetime.now(), [], "0").seal()]
+    for height in range(1, length):
+        transactions = [
+            {"from": "network", "to": f"0x{height}", "amount": height, "type": "reward"}
+        ]
+        blocks.append(Block(height, datetime.now(), transactions, blocks[-1].hash).seal())
+    return blocks
+
+@pytest.fixture
+def store(tmp_path):
+    store = BlockStore(str(tmp_path), segment_size=1024, cache_size=4)
+    yield store
+    store.close()
+
+def test_append_and_read(store):
+    blocks = make_chain(30)
+    for block in blocks:
+        store.append(block)
+
+    assert len(store) == 30
+    assert store._segment > 0  # Small segments force rollover
+    assert len(store._cache) == 4
+    assert [block.hash for block in store] == [block.hash for block in blocks]
+    assert store[-1].hash == blocks[-1].hash
+    assert [block.index for block in store[5:8]] == [5, 6, 7]
+    with pytest.raises(IndexError):
+        store[30]
+
+def test_reopen(tmp_path):
+    blocks = make_chain(10)
+    store = BlockStore(str(tmp_path), segment_size=1024)
+    for block in blocks:
+        store.append(block)
+    store.close()
+
+    reopened = BlockStore(str(tmp_path), segment_size=1024)
+    assert len(reopened) == 10
+    assert reopened[3] == blocks[3]
+    assert reopened[3].hash == blocks[3].hash
+    reopened.append(Block(10, datetime.now(), [], blocks[-1].hash))
+    assert reopened[10].previous_hash == blocks[-1].hash
+    reopened.close()
+
+def test_torn_index_record_is_dropped(tmp_path):
+    store = BlockStore(str(tmp_path))
+    for block in make_chain(3):
+        store.append(block)
+    store.close()
+
+    with open(tmp_path / BlockStore.INDEX_FILE, "ab") as index_file:
+        index_file.write(b"\x00\x01")
+
+    reopened = BlockStore(str(tmp_path))
+    assert len(reopened) == 3
+    reopened.close()
+
+def test_blockchain_on_block_store(tmp_path):
+    store = BlockStore(str(tmp_path))
+    for block in make_chain(5):
+        store.append(block)
+
+    blockchain = Blockchain(block_store=store)
+    assert len(blockchain.chain) == 5
+    assert blockchain.get_balance("0x4") == 4
+    assert blockchain.is_chain_valid() == True
+    store.close()
+
+def test_blockchain_creates_genesis_in_empty_store(store):
+    blockchain = Blockchain(block_store=store)
+    assert len(store) == 1
+    assert blockchain.get_latest_block().index == 0
+
+def test_indexes_persist_with_chain(tmp_path):
+    store = BlockStore(str(tmp_path))
+    blocks = make_chain(4)
+    for block in blocks:
+        store.append(block)
+    blockchain = Blockchain(block_store=store)
+    blockchain.take_snapshot()
+    transactions = [{"from": "0x1", "to": "0x2", "amount": 1}]
+    store.append(Block(4, datetime.now(), transactions, blocks[-1].hash))
+
+    restarted = Blockchain(block_store=store)
+    assert restarted.indexes.indexed_height == 4
+    assert restarted.get_block_by_hash(blocks[2].hash).index == 2
+    assert [entry["block_height"] for entry in restarted.get_address_history("0x1")] == [1, 4]
+    store.close()
+
+def test_truncate_rolls_back_across_segments(store, tmp_path):
+    blocks = make_chain(30)
+    for block in blocks:
+        store.append(block)
+    store.get(5)
+    last_segment = store._segment
+
+    store.truncate(6)
+    assert len(store) == 6
+    assert store._segment < last_segment
+    assert not (tmp_path / f"blocks_{last_segment:05d}.dat").exists()
+    replacement = Block(6, datetime.now(), [], blocks[5].hash).seal()
+    store.append(replacement)
+    assert store[-1].hash == replacement.hash
+    store.close()
+
+    reopened = BlockStore(str(tmp_path), segment_size=1024)
+    expected = [block.hash for block in blocks[:6]] + [replacement.hash]
+    assert [block.hash for block in reopened] == expected
+    reopened.close()
+
+def test_load_chain_writes_through_to_store(tmp_path):
+    store = BlockStore(str(tmp_path))
+    blocks = make_chain(4)
+    for block in blocks[:3]:
+        store.append(block)
+    blockchain = Blockchain(block_store=store)
+
+    replacement = Block(2, datetime.now(), [], blocks[1].hash).seal()
+    blockchain.load_chain(blocks[:2] + [replacement])
+    assert blockchain.chain is store
+    assert [block.hash for block in store] == [blocks[0].hash, blocks[1].hash, replacement.hash]
+
+    blockchain.load_chain(blocks)
+    assert len(store) == 4
+    store.close()
+
+    reopened = BlockStore(str(tmp_path))
+    assert [block.hash for block in reopened] == [block.hash for block in blocks]
+    assert Blockchain(block_store=reopened).get_balance("0x3") == 3
+    reopened.close()
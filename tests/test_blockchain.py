@@ -2,6 +2,8 @@ import pytest
 from datetime import datetime
 from src.blockchain.blockchain import Blockchain
 from src.blockchain.block import Block
+from src.blockchain.stats import ChainStats
+from src.blockchain.validation import ChainValidator
 
 @pytest.fixture
 def blockchain():
@@ -25,4 +27,240 @@ def test_get_balance(blockchain):
     blockchain.add_transaction("address1", "address2", 100)
     blockchain.mine_pending_transactions("miner-address")
     assert blockchain.get_balance("address1") == -100
-    assert blockchain.get_balance("address2") == 100
\ No newline at end of file
+    assert blockchain.get_balance("address2") == 100
+
+def make_block(previous_block, transactions, previous_hash=None):
+    block = Block(previous_block.index + 1, datetime.now(), transactions,
+                  previous_hash or previous_block.hash)
+    return block.seal()
+
+@pytest.fixture
+def funded_blockchain(blockchain):
+    reward = {"from": "network", "to": "validator", "amount": 500, "type": "reward"}
+    blockchain.load_chain(blockchain.chain + [make_block(blockchain.chain[0], [reward])])
+    blockchain.add_validator("validator", 2000)
+    blockchain.pos.get_next_validator = lambda: "validator"
+    blockchain.pos.validate_block = lambda address, block_data: True
+    return blockchain
+
+def test_balance_ledger_rebuilt_on_load(funded_blockchain):
+    assert funded_blockchain.get_balance("validator") == 500
+    assert funded_blockchain.get_balance("network") == -500
+    assert funded_blockchain.get_balance("unknown") == 0
+
+def test_balance_ledger_updated_by_process_block(funded_blockchain):
+    assert funded_blockchain.add_transaction("validator", "alice", 100, fee=1) == True
+    block = funded_blockchain.process_block("validator")
+    assert block is not None
+
+    reward = block.transactions[-1]["amount"]
+    assert funded_blockchain.get_balance("alice") == 100
+    assert funded_blockchain.get_balance("validator") == 500 - 100 - 1 + reward
+
+    # Ledger must agree with a full replay of the chain
+    funded_blockchain.load_chain(funded_blockchain.chain)
+    assert funded_blockchain.get_balance("alice") == 100
+    assert funded_blockchain.get_balance("validator") == 500 - 100 - 1 + reward
+
+def test_add_transaction_insufficient_balance(funded_blockchain):
+    assert funded_blockchain.add_transaction("alice", "bob", 10) == False
+    assert funded_blockchain.add_transaction("validator", "bob", 1000) == False
+
+def test_validate_chain(funded_blockchain):
+    funded_blockchain.add_transaction("validator", "alice", 100)
+    funded_blockchain.process_block("validator")
+    result = funded_blockchain.validate_chain()
+    assert result.is_valid == True
+    assert result.invalid_height is None
+
+def test_validate_chain_reports_first_invalid_height(funded_blockchain):
+    chain = funded_blockchain.chain
+    chain.append(make_block(chain[-1], [{"from": "alice", "to": "bob", "amount": 10, "fee": 1}]))
+    chain.append(make_block(chain[-1], []))
+
+    result = funded_blockchain.validate_chain()
+    assert result.is_valid == False
+    assert result.invalid_height == 2
+    assert funded_blockchain.is_chain_valid() == False
+
+def test_validate_chain_detects_tampering(funded_blockchain):
+    funded_blockchain.chain[1].transactions[0]["amount"] = 10 ** 6
+    result = funded_blockchain.validate_chain()
+    assert result.invalid_height == 1
+    assert result.reason == "merkle root mismatch"
+
+def test_parallel_validation_matches_sequential(funded_blockchain):
+    chain = funded_blockchain.chain
+    for i in range(6):
+        chain.append(make_block(chain[-1], [{"from": "validator", "to": f"user{i}", "amount": 1}]))
+    assert funded_blockchain.validate_chain(parallel=True, workers=3).is_valid == True
+
+    # Break the link at a segment boundary and inside a segment
+    chain[4] = make_block(chain[3], list(chain[4].transactions), previous_hash="bad")
+    chain[6].transactions[0]["amount"] = 1000
+
+    sequential = funded_blockchain.validate_chain()
+    parallel = funded_blockchain.validate_chain(parallel=True, workers=3)
+    assert parallel == sequential
+    assert parallel.invalid_height == 4
+
+def test_pending_spends_count_against_balance(funded_blockchain):
+    assert funded_blockchain.add_transaction("validator", "alice", 300, fee=1) == True
+    assert funded_blockchain.get_available_balance("validator") == 199
+    # Would be affordable against confirmed state, but not with the pending spend
+    assert funded_blockchain.add_transaction("validator", "bob", 300, fee=1) == False
+    assert funded_blockchain.add_transaction("validator", "bob", 150, fee=1) == True
+
+def test_process_block_respects_capacity(funded_blockchain):
+    funded_blockchain.block_builder.max_transactions = 2
+    for fee in (1, 3, 2):
+        funded_blockchain.add_transaction("validator", "alice", 10, fee=fee)
+
+    block = funded_blockchain.process_block("validator")
+    assert [tx["fee"] for tx in block.transactions[:-1]] == [1, 3]
+    assert len(funded_blockchain.mempool) == 1
+    assert funded_blockchain.get_blockchain_stats()["last_block"]["fill_ratio"] == 1.0
+
+def test_sealed_blocks_are_immutable(funded_blockchain):
+    block = funded_blockchain.get_latest_block()
+    assert block.is_sealed == True
+    assert block.hash == block.calculate_hash()
+    with pytest.raises(AttributeError):
+        block.nonce = 1
+    with pytest.raises(AttributeError):
+        block.transactions.append({"from": "network", "to": "mallory", "amount": 1})
+
+def test_lookup_indexes(funded_blockchain):
+    funded_blockchain.add_transaction("validator", "alice", 100)
+    block = funded_blockchain.process_block("validator")
+
+    assert funded_blockchain.get_block_by_hash(block.hash) is block
+    assert funded_blockchain.get_block_by_hash("missing") is None
+
+    tx_hash = block.transaction_hashes()[0]
+    found = funded_blockchain.get_transaction(tx_hash)
+    assert found["block_height"] == block.index
+    assert found["position"] == 0
+    assert found["transaction"]["to"] == "alice"
+
+    history = funded_blockchain.get_address_history("validator")
+    assert [entry["block_height"] for entry in history] == [1, 2, 2]
+    assert funded_blockchain.get_address_history("nobody") == []
+
+def test_rewards_are_indexed_per_block(funded_blockchain):
+    blocks = []
+    for amount in (10, 10):
+        funded_blockchain.add_transaction("validator", "alice", amount)
+        blocks.append(funded_blockchain.process_block("validator"))
+
+    reward_hashes = [block.transaction_hashes()[-1] for block in blocks]
+    assert reward_hashes[0] != reward_hashes[1]
+    for block, reward_hash in zip(blocks, reward_hashes):
+        assert funded_blockchain.get_transaction(reward_hash)["block_height"] == block.index
+
+def test_block_template_metrics_reported(funded_blockchain):
+    class RecordingMetrics:
+        def __init__(self):
+            self.updates = []
+
+        def update_block_template_metrics(self, fill_ratio, fees):
+            self.updates.append((fill_ratio, fees))
+
+    funded_blockchain.metrics = RecordingMetrics()
+    funded_blockchain.add_transaction("validator", "alice", 10, fee=2)
+    funded_blockchain.process_block("validator")
+
+    template = funded_blockchain.last_block_template
+    assert funded_blockchain.metrics.updates == [(template.fill_ratio, 2)]
+    assert template.fill_ratio > 0
+
+def test_blockchain_stats(funded_blockchain):
+    for amount in (10, 20):
+        funded_blockchain.add_transaction("validator", "alice", amount)
+        funded_blockchain.process_block("validator")
+
+    stats = funded_blockchain.get_blockchain_stats()
+    assert stats["total_blocks"] == 4
+    assert stats["total_transactions"] == 5
+    assert stats["min_block_interval"] <= stats["average_block_time"] <= stats["max_block_interval"]
+    assert stats["recent"]["blocks"] == 4
+
+def test_windowed_stats():
+    stats = ChainStats(window=2)
+    for height, timestamp in enumerate([0.0, 10.0, 15.0, 35.0]):
+        transactions = [{"from": "a", "to": "b", "amount": 1}] * height
+        stats.add_block(Block(height, timestamp, transactions, "0"))
+
+    summary = stats.to_dict()
+    assert summary["total_transactions"] == 6
+    assert summary["average_block_time"] == pytest.approx(35 / 3)
+    assert summary["min_block_interval"] == 5.0
+    assert summary["max_block_interval"] == 20.0
+    assert summary["window"]["transactions"] == 5
+    assert summary["window"]["average_block_time"] == pytest.approx(12.5)
+
+def test_pruned_node_keeps_recent_bodies():
+    blockchain = Blockchain(prune_depth=2)
+    reward = {"from": "network", "to": "validator", "amount": 500, "type": "reward"}
+    blockchain.load_chain(blockchain.chain + [make_block(blockchain.chain[0], [reward])])
+    blockchain.add_validator("validator", 2000)
+    blockchain.pos.get_next_validator = lambda: "validator"
+    blockchain.pos.validate_block = lambda address, block_data: True
+
+    for amount in (10, 20, 30):
+        blockchain.add_transaction("validator", "alice", amount)
+        blockchain.process_block("validator")
+
+    assert len(blockchain.chain) == 5
+    assert blockchain.pruned_height == 2
+    assert [block.is_pruned for block in blockchain.chain] == [True, True, True, False, False]
+    assert blockchain.chain[2].transactions == ()
+    assert blockchain.get_balance("alice") == 60
+
+    # Headers still resolve by hash, but pruned transactions are gone from the indexes
+    assert blockchain.get_block_by_hash(blockchain.chain[1].hash) is blockchain.chain[1]
+    assert [entry["block_height"] for entry in blockchain.get_address_history("alice")] == [3, 4]
+    assert blockchain.validate_chain().is_valid == True
+    assert blockchain.get_transaction_proof(3, 0)["position"] == 0
+    with pytest.raises(ValueError):
+        blockchain.get_transaction_proof(2, 0)
+
+    # Reloading a pruned chain is refused without touching the node's state
+    chain = list(blockchain.chain)
+    with pytest.raises(ValueError):
+        blockchain.load_chain(chain)
+    assert blockchain.chain == chain
+    assert blockchain.pruned_height == 2
+    assert blockchain.get_balance("alice") == 60
+    assert blockchain.validate_chain().is_valid == True
+
+def test_pruned_chain_detects_broken_header_link():
+    blockchain = Blockchain(prune_depth=1)
+    chain = blockchain.chain + [make_block(blockchain.chain[0], [])]
+    blockchain.load_chain(chain + [make_block(chain[1], [])])
+    blockchain.chain.append(make_block(blockchain.chain[2], [], previous_hash="bogus"))
+
+    result = blockchain.validate_chain()
+    assert result.is_valid == False
+    assert result.invalid_height == 3
+
+def test_nonces_assigned_and_confirmed(funded_blockchain):
+    assert funded_blockchain.add_transaction("validator", "alice", 10) == True
+    assert funded_blockchain.add_transaction("validator", "alice", 20) == True
+    assert [tx["nonce"] for tx in funded_blockchain.pending_transactions] == [0, 1]
+
+    funded_blockchain.process_block("validator")
+    assert funded_blockchain.get_nonce("validator") == 2
+    assert funded_blockchain.add_transaction("validator", "alice", 10, nonce=0) == False
+    assert funded_blockchain.add_transaction("validator", "alice", 10, nonce=3) == False
+    assert funded_blockchain.add_transaction("validator", "alice", 10, nonce=2) == True
+
+def test_validate_chain_rejects_replayed_transaction(funded_blockchain):
+    funded_blockchain.add_transaction("validator", "alice", 10)
+    block = funded_blockchain.process_block("validator")
+    replay = make_block(block, [block.transactions[0]])
+
+    result = ChainValidator().validate(funded_blockchain.chain + [replay])
+    assert result.is_valid == False
+    assert result.invalid_height == replay.index
+    assert result.reason == "unexpected nonce for validator"
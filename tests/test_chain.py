@@ -0,0 +1,134 @@
+import pytest
+from datetime import datetime
+from src.blockchain.block import Block
+from src.blockchain.block_store import BlockStore
+from src.blockchain.block_tree import BlockTree
+from src.blockchain.chain import Blockchain
+
+def mine(parent, transactions=(), difficulty=1, nonce=0):
+    block = Block(parent.index + 1, datetime.now().timestamp(), list(transactions), parent.hash,
+                  nonce)
+    block.mine_block(difficulty)
+    return block
+
+@pytest.fixture
+def blockchain():
+    return Blockchain(difficulty=1)
+
+def test_out_of_order_blocks_connect_when_parent_arrives(blockchain):
+    first = mine(blockchain.chain[0])
+    second = mine(first)
+    third = mine(second)
+
+    assert blockchain.add_block(third) == True
+    assert blockchain.add_block(second) == True
+    assert len(blockchain.chain) == 1
+    assert len(blockchain.tree.orphans) == 2
+
+    assert blockchain.add_block(first) == True
+    assert [block.hash for block in blockchain.chain[1:]] == [first.hash, second.hash, third.hash]
+    assert len(blockchain.tree.orphans) == 0
+
+def test_rejects_duplicate_and_invalid_blocks(blockchain):
+    block = mine(blockchain.chain[0])
+    assert blockchain.add_block(block) == True
+    assert blockchain.add_block(block) == False
+    assert blockchain.add_block(Block(5, 0.0, [], blockchain.chain[0].hash)) == False
+
+def test_heavier_branch_reorganizes_suffix(blockchain):
+    genesis = blockchain.chain[0]
+    shared = mine(genesis)
+    blockchain.add_block(shared)
+
+    lost_tx = {"from": "alice", "to": "bob", "amount": 5}
+    kept_tx = {"from": "carol", "to": "dave", "amount": 7}
+    main = mine(shared, [lost_tx, kept_tx])
+    assert blockchain.add_block(main) == True
+
+    # An equally heavy branch does not replace the first one seen
+    fork = mine(shared, [kept_tx], nonce=10 ** 6)
+    assert blockchain.add_block(fork) == True
+    assert blockchain.get_latest_block().hash == main.hash
+
+    extension = mine(fork)
+    assert blockchain.add_block(extension) == True
+    expected = [genesis.hash, shared.hash, fork.hash, extension.hash]
+    assert [block.hash for block in blockchain.chain] == expected
+    assert blockchain.tree.tip.block.hash == extension.hash
+    assert blockchain.pending_transactions == [lost_tx]
+
+def test_reorganize_on_block_store(tmp_path):
+    store = BlockStore(str(tmp_path))
+    blockchain = Blockchain(difficulty=1, block_store=store)
+    genesis = blockchain.chain[0]
+    blockchain.add_block(mine(genesis))
+
+    fork = mine(genesis, nonce=10 ** 6)
+    extension = mine(fork)
+    blockchain.add_block(extension)
+    blockchain.add_block(fork)
+    assert [block.hash for block in store] == [genesis.hash, fork.hash, extension.hash]
+    store.close()
+
+def test_tree_prunes_below_reorg_depth():
+    blockchain = Blockchain(difficulty=1, max_reorg_depth=2)
+    stale = mine(blockchain.chain[0], nonce=10 ** 6)
+    blockchain.add_block(stale)
+    for _ in range(4):
+        blockchain.add_block(mine(blockchain.get_latest_block()))
+
+    assert blockchain.tree.root_height == 3
+    assert sorted(node.height for node in blockchain.tree.nodes.values()) == [3, 4, 5]
+
+def test_orphan_pool_is_bounded():
+    tree = BlockTree(max_orphans=2)
+    blocks = [Block(1, float(nonce), [], "missing", nonce).seal() for nonce in range(3)]
+    for block in blocks:
+        tree.add_orphan(block)
+
+    assert list(tree.orphans) == [blocks[1].hash, blocks[2].hash]
+    orphans = tree.take_orphans("missing")
+    assert [block.hash for block in orphans] == [blocks[1].hash, blocks[2].hash]
+    assert "missing" not in tree.orphans_by_parent
+
+def test_block_mined_after_early_read_is_accepted():
+    blockchain = Blockchain(difficulty=2)
+    parent = blockchain.chain[0]
+    transactions = [{"from": "a", "to": "b", "amount": 1}]
+    block = Block(1, datetime.now().timestamp(), transactions, parent.hash)
+    block.to_dict()
+    block.transactions.append({"from": "a", "to": "c", "amount": 2})
+    block.mine_block(2)
+
+    assert block.hash.startswith("00")
+    assert blockchain.add_block(block) == True
+
+def test_header_with_swapped_body_is_rejected(blockchain):
+    from src.blockchain.codec import encode_block
+
+    honest = mine(blockchain.chain[0], [{"from": "a", "to": "b", "amount": 1}])
+    forged_tx = {"from": "a", "to": "b", "amount": 1000}
+    forged = Block.deserialize(encode_block(honest.serialize_header(), [forged_tx]))
+    assert forged.hash == honest.hash
+    assert blockchain.add_block(forged) == False
+
+    # Also rejected as an orphan, before its parent is known
+    child = mine(honest)
+    orphan = Block.deserialize(encode_block(child.serialize_header(), [forged_tx]))
+    assert blockchain.add_block(orphan) == False
+
+def test_body_mutated_after_mining_is_rejected(blockchain):
+    transactions = [{"from": "a", "to": "b", "amount": 1}]
+    block = mine(blockchain.chain[0], transactions)
+    transactions[0]["amount"] = 1000
+    assert blockchain.add_block(block) == False
+
+def test_reorg_settles_identical_transactions_one_at_a_time(blockchain):
+    tx = {"from": "a", "to": "b", "amount": 1}
+    genesis = blockchain.chain[0]
+    assert blockchain.add_block(mine(genesis, [tx, tx])) == True
+
+    fork = mine(genesis, [tx], nonce=1)
+    assert blockchain.add_block(fork) == True
+    assert blockchain.add_block(mine(fork)) == True
+    assert blockchain.pending_transactions == [tx]
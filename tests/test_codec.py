@@ -0,0 +1,50 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from src.blockchain.block import Block
+from src.blockchain.codec import decode, decode_header, encode
+from src.blockchain.transaction import Transaction, transaction_hash
+
+def test_round_trip():
+    value = {
+        "from": "0x1",
+        "amount": 12.5,
+        "fee": Decimal("0.001"),
+        "nonce": 2 ** 70,
+        "negative": -3,
+        "flags": [True, False, None],
+        "payload": b"\x00\x01",
+        "timestamp": datetime(2024, 1, 19, 12, 30)
+    }
+    assert decode(encode(value)) == value
+
+def test_encoding_is_canonical():
+    first = {"from": "0x1", "to": "0x2", "amount": 10}
+    second = {"amount": 10, "to": "0x2", "from": "0x1"}
+    assert bytes(encode(first)) == bytes(encode(second))
+    assert transaction_hash(first) == transaction_hash(second)
+    assert bytes(encode(1)) != bytes(encode(1.0))
+
+def test_decode_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode(bytes(encode("abc")) + b"\x00")
+    with pytest.raises(TypeError):
+        encode(object())
+
+def test_block_round_trip():
+    transactions = [{"from": "0x1", "to": "0x2", "amount": 10, "fee": 0.1}]
+    block = Block(3, datetime.now(), transactions, "ab" * 32, nonce=42)
+    decoded = Block.deserialize(block.serialize())
+    assert decoded == block
+    assert decoded.calculate_hash() == block.calculate_hash()
+
+    header = decode_header(block.serialize_header())
+    assert header["nonce"] == 42
+    assert header["merkle_root"] == block.merkle_root
+
+def test_transaction_hash_is_stable():
+    tx = Transaction("0x1", "0x2", 10.0, timestamp=1700000000.0)
+    same = Transaction("0x1", "0x2", 10.0, timestamp=1700000000.0)
+    different = Transaction("0x1", "0x2", 10.5, timestamp=1700000000.0)
+    assert tx.calculate_hash() == same.calculate_hash()
+    assert tx.calculate_hash() != different.calculate_hash()
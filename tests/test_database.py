@@ -0,0 +1,79 @@
+import asyncio
+import importlib
+import sys
+from contextlib import contextmanager
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+MODULE = "src.database.connection"
+
+@contextmanager
+def isolated_connection(monkeypatch, database_url):
+    """A private copy of the connection module bound to database_url.
+
+    The module reads its URLs at import time, so it is imported afresh and
+    the previously imported module is put back on exit; later tests never
+    see engines pointing at a deleted temp directory.
+    """
+    import src.database as package
+
+    monkeypatch.setenv("DATABASE_URL", database_url)
+    monkeypatch.delenv("ASYNC_DATABASE_URL", raising=False)
+    previous = sys.modules.pop(MODULE, None)
+    try:
+        connection = importlib.import_module(MODULE)
+        try:
+            yield connection
+        finally:
+            asyncio.run(connection.dispose_async_engine())
+            connection.engine.dispose()
+    finally:
+        if previous is not None:
+            sys.modules[MODULE] = previous
+            package.connection = previous
+        else:
+            sys.modules.pop(MODULE, None)
+            if hasattr(package, "connection"):
+                del package.connection
+
+@pytest.fixture
+def connection(tmp_path, monkeypatch):
+    with isolated_connection(monkeypatch, f"sqlite:///{tmp_path / 'adac.db'}") as connection:
+        yield connection
+
+def test_async_url_translation(connection):
+    assert (connection.to_async_url("postgresql://u:p@db:5432/adac") ==
+            "postgresql+asyncpg://u:p@db:5432/adac")
+    assert connection.to_async_url("sqlite:///local.db") == "sqlite+aiosqlite:///local.db"
+    assert connection.pool_options("sqlite:///local.db") == {}
+    assert connection.pool_options("postgresql://db/adac")["pool_pre_ping"] == True
+
+def test_async_session_dependency(connection):
+    from sqlalchemy import select
+    from src.database.models import Account, Base
+
+    Base.metadata.create_all(connection.engine)
+    with connection.SessionLocal() as db:
+        db.add(Account(address="0x1", balance=12.5, nonce=2))
+        db.commit()
+
+    async def read_balance():
+        sessions = connection.get_async_db()
+        db = await sessions.__anext__()
+        try:
+            result = await db.execute(select(Account.balance).where(Account.address == "0x1"))
+            return result.scalar_one()
+        finally:
+            await sessions.aclose()
+
+    assert asyncio.run(read_balance()) == 12.5
+
+def test_connection_module_restored(tmp_path, monkeypatch):
+    with isolated_connection(monkeypatch, "sqlite://") as original:
+        with isolated_connection(monkeypatch, f"sqlite:///{tmp_path / 'adac.db'}") as isolated:
+            assert isolated is not original
+            assert sys.modules[MODULE] is isolated
+        assert sys.modules[MODULE] is original
+        assert str(original.engine.url) == "sqlite://"
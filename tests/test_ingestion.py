@@ -0,0 +1,142 @@
+import pytest
+from datetime import datetime
+from src.blockchain.block import Block
+from src.blockchain.blockchain import Blockchain
+from src.blockchain.ingestion import IngestionPipeline, precheck_transaction
+
+@pytest.fixture
+def blockchain():
+    blockchain = Blockchain()
+    genesis = blockchain.chain[0]
+    reward = {"from": "network", "to": "alice", "amount": 100, "type": "reward"}
+    blockchain.load_chain([genesis, Block(1, datetime.now(), [reward], genesis.hash).seal()])
+    return blockchain
+
+def transfer(amount, fee=1, sender="alice", nonce=0, **extra):
+    transaction = {"from": sender, "to": "bob", "amount": amount, "fee": fee, "nonce": nonce}
+    return dict(transaction, **extra)
+
+def test_precheck_rejects_without_state():
+    assert precheck_transaction(transfer(10), 0.5).accepted == True
+    assert precheck_transaction(transfer(10), 0.5).tx_hash is not None
+    assert precheck_transaction(transfer(10, fee=0.1), 0.5).reason == "fee below minimum"
+    assert precheck_transaction(transfer(-5), 0.5).reason == "invalid amount"
+    assert precheck_transaction({"from": "alice"}, 0.5).reason == "malformed transaction"
+    assert precheck_transaction(transfer(10, sender="network"), 0.5).reason == "reserved sender"
+    assert precheck_transaction(transfer(10, nonce=-1), 0.5).reason == "invalid nonce"
+    assert precheck_transaction(transfer(10, nonce=None), 0.5).reason == "invalid nonce"
+    unsigned = precheck_transaction(transfer(10), 0.5, require_signature=True)
+    assert unsigned.reason == "missing signature"
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_pipeline_admits_in_order(blockchain, processes):
+    batch = [transfer(30), transfer(30, fee=0.0001, nonce=1), transfer(31, nonce=1),
+             transfer(32, nonce=2), transfer(5, nonce=3)]
+    with IngestionPipeline(blockchain, workers=2, processes=processes, chunk_size=2) as pipeline:
+        admissions = pipeline.admit(batch)
+
+    assert [admission.reason for admission in admissions] == [
+        None, "fee below minimum", None, None, "insufficient balance"
+    ]
+    assert len(blockchain.mempool) == 3
+    assert blockchain.get_available_balance("alice") == 100 - 30 - 31 - 32 - 3
+
+def test_pipeline_rejects_duplicates(blockchain):
+    tx = transfer(10, timestamp="2024-01-01T00:00:00")
+    with IngestionPipeline(blockchain, workers=2) as pipeline:
+        first = pipeline.submit([tx])
+        second = pipeline.submit([dict(tx)])
+        assert first.result()[0].accepted == True
+        assert second.result()[0].reason == "duplicate nonce"
+
+def test_pipeline_checks_signatures(blockchain):
+    pytest.importorskip("cryptography")
+    from src.blockchain.signatures import generate_keypair
+    from src.blockchain.transaction import sign_transaction
+
+    private_key, public_key = generate_keypair()
+    blockchain.ledger.balances[public_key] = 50
+    signed = sign_transaction(transfer(10, sender=public_key), private_key)
+    forged = dict(signed, amount=20)
+
+    with IngestionPipeline(blockchain, workers=2, require_signatures=True) as pipeline:
+        admissions = pipeline.admit([signed, forged, transfer(10)])
+    assert [admission.reason for admission in admissions] == [
+        None, "invalid signature", "missing signature"
+    ]
+
+def test_nonces_reject_replays_and_gaps(blockchain):
+    with IngestionPipeline(blockchain, workers=2) as pipeline:
+        admissions = pipeline.admit([transfer(10), transfer(11), transfer(12, nonce=2),
+                                     transfer(13, nonce=1)])
+    assert [admission.reason for admission in admissions] == [
+        None, "duplicate nonce", "nonce gap", None
+    ]
+    assert blockchain.get_next_nonce("alice") == 2
+    assert blockchain.get_nonce("alice") == 0
+
+def test_blocks_build_while_pipeline_admits():
+    import threading
+    import time
+
+    senders = [f"sender{i}" for i in range(500)]
+    blockchain = Blockchain()
+    genesis = blockchain.chain[0]
+    rewards = [
+        {"from": "network", "to": sender, "amount": 1000, "type": "reward"} for sender in senders
+    ]
+    blockchain.load_chain([genesis, Block(1, datetime.now(), rewards, genesis.hash).seal()])
+    blockchain.add_validator("validator", 2000)
+    blockchain.pos.get_next_validator = lambda: "validator"
+    blockchain.pos.validate_block = lambda address, block_data: True
+
+    # Widen the build window and record any mempool insert that lands inside it
+    building = threading.Event()
+    overlaps = []
+    build, add = blockchain.block_builder.build, blockchain.mempool.add
+
+    def slow_build(mempool, ledger=None):
+        building.set()
+        try:
+            time.sleep(0.002)
+            return build(mempool, ledger)
+        finally:
+            building.clear()
+
+    def checked_add(*args, **kwargs):
+        if building.is_set():
+            overlaps.append(args[0])
+        return add(*args, **kwargs)
+
+    blockchain.block_builder.build = slow_build
+    blockchain.mempool.add = checked_add
+
+    batches = [
+        [transfer(1, sender=sender, nonce=nonce) for sender in senders] for nonce in range(10)
+    ]
+    errors = []
+    done = threading.Event()
+
+    def produce_blocks():
+        try:
+            while not done.is_set():
+                blockchain.process_block("validator")
+        except Exception as error:
+            errors.append(error)
+
+    producer = threading.Thread(target=produce_blocks)
+    producer.start()
+    with IngestionPipeline(blockchain, workers=4, chunk_size=50) as pipeline:
+        results = [pipeline.submit(batch) for batch in batches]
+        admissions = [admission for result in results for admission in result.result()]
+    done.set()
+    producer.join()
+    while blockchain.process_block("validator"):
+        pass
+
+    assert errors == []
+    assert overlaps == []
+    assert all(admission.accepted for admission in admissions)
+    assert len(blockchain.mempool) == 0
+    assert blockchain.is_chain_valid() == True
+    assert all(blockchain.get_nonce(sender) == 10 for sender in senders)
@@ -0,0 +1,133 @@
+import pytest
+from src.blockchain.block_builder import BlockTemplateBuilder
+from src.blockchain.ledger import BalanceLedger
+from src.blockchain.mempool import Mempool
+
+def make_tx(sender, amount, fee, recipient="0xrecipient"):
+    return {"from": sender, "to": recipient, "amount": amount, "fee": fee}
+
+@pytest.fixture
+def mempool():
+    return Mempool(max_transactions=3)
+
+def test_add_transaction(mempool):
+    tx_hash = mempool.add(make_tx("0x1", 10, 0.1))
+    assert tx_hash is not None
+    assert tx_hash in mempool
+    assert len(mempool) == 1
+
+    # Duplicates are rejected
+    assert mempool.add(make_tx("0x1", 10, 0.1)) is None
+    assert len(mempool) == 1
+
+def test_priority_order(mempool):
+    mempool.add(make_tx("0x1", 10, 0.1))
+    mempool.add(make_tx("0x2", 10, 0.5))
+    mempool.add(make_tx("0x3", 10, 0.3))
+
+    fees = [tx["fee"] for tx in mempool.get_transactions()]
+    assert fees == [0.5, 0.3, 0.1]
+    assert [tx["fee"] for tx in mempool.get_transactions(limit=1)] == [0.5]
+
+def test_sender_order_preserved(mempool):
+    mempool.add(make_tx("0x1", 10, 0.1))
+    mempool.add(make_tx("0x1", 20, 0.9))
+    mempool.add(make_tx("0x2", 10, 0.5))
+
+    amounts = [(tx["from"], tx["amount"]) for tx in mempool.get_transactions()]
+    assert amounts == [("0x2", 10), ("0x1", 10), ("0x1", 20)]
+
+def test_eviction_when_full(mempool):
+    low_hash = mempool.add(make_tx("0x1", 10, 0.1))
+    mempool.add(make_tx("0x2", 10, 0.2))
+    mempool.add(make_tx("0x3", 10, 0.3))
+
+    # Cheaper than everything in a full pool
+    assert mempool.add(make_tx("0x4", 10, 0.01)) is None
+
+    # Outbids the cheapest entry, which gets evicted
+    assert mempool.add(make_tx("0x5", 10, 0.5)) is not None
+    assert len(mempool) == 3
+    assert low_hash not in mempool
+
+def test_byte_cap():
+    mempool = Mempool(max_bytes=200)
+    for i in range(10):
+        mempool.add(make_tx(f"0x{i}", 10, 0.1 * (i + 1)))
+    assert mempool.total_bytes <= 200
+    assert mempool.get_transactions()[0]["fee"] == pytest.approx(1.0)
+
+def test_remove_many(mempool):
+    hashes = [mempool.add(make_tx("0x1", i, 0.1)) for i in range(3)]
+    mempool.remove_many(hashes[:2])
+    assert len(mempool) == 1
+    assert mempool.get(hashes[2])["amount"] == 2
+    assert mempool.total_bytes > 0
+
+def test_reserved_amounts(mempool):
+    first = mempool.add(make_tx("0x1", 10, 0.5))
+    second = mempool.add(make_tx("0x1", 20, 0.5))
+    assert mempool.get_reserved("0x1") == pytest.approx(31)
+
+    mempool.remove(first)
+    assert mempool.get_reserved("0x1") == pytest.approx(20.5)
+    mempool.remove(second)
+    assert mempool.get_reserved("0x1") == 0
+
+def test_block_template_capacity():
+    mempool = Mempool()
+    for i in range(5):
+        mempool.add(make_tx(f"0x{i}", 10, 0.1 * (i + 1)))
+
+    template = BlockTemplateBuilder(max_transactions=2).build(mempool)
+    assert [tx["fee"] for tx in template.transactions] == [0.5, 0.4]
+    assert template.total_fees == pytest.approx(0.9)
+    assert template.fill_ratio == 1.0
+    assert len(mempool) == 5  # Building a template does not consume the pool
+
+def test_block_template_skips_insolvent_senders():
+    mempool = Mempool()
+    mempool.add(make_tx("0x1", 10, 0.5))
+    mempool.add(make_tx("0x1", 10, 0.5))
+    mempool.add(make_tx("0x2", 10, 0.1))
+
+    ledger = BalanceLedger()
+    ledger.balances = {"0x1": 15, "0x2": 15}
+    template = BlockTemplateBuilder().build(mempool, ledger)
+    assert [(tx["from"], tx["fee"]) for tx in template.transactions] == [("0x1", 0.5), ("0x2", 0.1)]
+
+def test_nonce_ordered_sender_queue():
+    mempool = Mempool()
+    tx_hashes = {}
+    for nonce in (1, 0, 2):
+        tx_hashes[nonce] = mempool.add(dict(make_tx("0x1", 10 + nonce, 0.1), nonce=nonce))
+
+    assert [tx["nonce"] for tx in mempool.get_transactions()] == [0, 1, 2]
+    assert mempool.next_nonce("0x1") == 3
+    assert mempool.next_nonce("0x2") is None
+
+    # A different payload reusing a pending nonce is rejected without a scan
+    assert mempool.add(dict(make_tx("0x1", 99, 0.5), nonce=1)) is None
+
+    mempool.remove(tx_hashes[1])
+    assert mempool.add(dict(make_tx("0x1", 99, 0.5), nonce=1)) is not None
+
+def test_eviction_drops_later_nonces(mempool):
+    mempool.add(dict(make_tx("0x1", 10, 0.1), nonce=0))
+    mempool.add(dict(make_tx("0x1", 10, 0.9), nonce=1))
+    mempool.add(make_tx("0x2", 10, 0.3))
+
+    # Evicting nonce 0 strands nonce 1, so both leave the pool
+    assert mempool.add(make_tx("0x3", 10, 0.5)) is not None
+    assert len(mempool) == 2
+    assert mempool.next_nonce("0x1") is None
+
+def test_builder_skips_nonce_gaps(mempool):
+    ledger = BalanceLedger()
+    ledger.balances = {"0x1": 100, "0x2": 100}
+    ledger.nonces = {"0x1": 1}
+    mempool.add(dict(make_tx("0x1", 10, 0.5), nonce=2))
+    mempool.add(dict(make_tx("0x2", 10, 0.1), nonce=0))
+
+    template = BlockTemplateBuilder().build(mempool, ledger)
+    assert [tx["from"] for tx in template.transactions] == ["0x2"]
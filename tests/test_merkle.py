@@ -0,0 +1,66 @@
+import hashlib
+import pytest
+from src.blockchain.block import Block
+from src.blockchain.merkle import EMPTY_ROOT, merkle_proof, merkle_root, verify_merkle_proof
+
+@pytest.fixture
+def tx_hashes():
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(7)]
+
+def test_merkle_root(tx_hashes):
+    assert merkle_root([]) == EMPTY_ROOT
+    assert merkle_root(tx_hashes[:1]) != tx_hashes[0]
+    assert merkle_root(tx_hashes) != merkle_root(tx_hashes[:6])
+    assert merkle_root(tx_hashes) == merkle_root(list(tx_hashes))
+
+def test_merkle_proofs(tx_hashes):
+    root = merkle_root(tx_hashes)
+    for index, tx_hash in enumerate(tx_hashes):
+        proof = merkle_proof(tx_hashes, index)
+        assert len(proof) <= 3
+        assert verify_merkle_proof(tx_hash, proof, root, index, len(tx_hashes)) == True
+
+    # A proof does not verify a different transaction, position or tree size
+    assert verify_merkle_proof(tx_hashes[1], merkle_proof(tx_hashes, 0), root, 0, 7) == False
+    assert verify_merkle_proof(tx_hashes[0], merkle_proof(tx_hashes, 0), root, 1, 7) == False
+    assert verify_merkle_proof(tx_hashes[6], merkle_proof(tx_hashes, 6), root, 6, 8) == False
+
+    with pytest.raises(IndexError):
+        merkle_proof(tx_hashes, 7)
+
+def test_block_commits_to_merkle_root():
+    transactions = [{"from": "0x1", "to": "0x2", "amount": i} for i in range(3)]
+    block = Block(1, 0.0, transactions, "0" * 64)
+    assert block.merkle_root == merkle_root(block.transaction_hashes())
+    assert block.has_valid_merkle_root() == True
+    tx_hash = block.transaction_hashes()[2]
+    assert verify_merkle_proof(tx_hash, block.get_merkle_proof(2), block.merkle_root, 2, 3)
+
+    block.seal()
+    transactions[0]["amount"] = 100
+    assert block.has_valid_merkle_root() == False
+
+def test_odd_levels_do_not_duplicate(tx_hashes):
+    # Duplicating the last transaction must not reproduce the same root
+    assert merkle_root(tx_hashes[:3]) != merkle_root(tx_hashes[:3] + tx_hashes[2:3])
+
+def test_inner_nodes_are_not_leaves(tx_hashes):
+    # An inner node with the rest of the path must not verify as a transaction
+    root = merkle_root(tx_hashes[:4])
+    leaves = [merkle_root([tx_hash]) for tx_hash in tx_hashes[:4]]
+    inner_bytes = b"\x01" + bytes.fromhex(leaves[0]) + bytes.fromhex(leaves[1])
+    inner = hashlib.sha256(inner_bytes).hexdigest()
+    proof = merkle_proof(tx_hashes[:4], 0)[1:]
+    assert verify_merkle_proof(inner, proof, root, 0, 2) == False
+    assert verify_merkle_proof(inner, proof, root, 0, 4) == False
+
+def test_unsealed_block_tracks_appends():
+    block = Block(1, 0.0, [{"from": "0x1", "to": "0x2", "amount": 1}], "0" * 64)
+    block.to_dict()
+    block.transactions.append({"from": "0x1", "to": "0x3", "amount": 2})
+    assert block.merkle_root == merkle_root(block.transaction_hashes())
+
+    block_hash = block.mine_block(2)
+    assert block_hash.startswith("00")
+    assert block_hash == block.calculate_hash()
+    assert block.has_valid_merkle_root() == True
@@ -0,0 +1,50 @@
+import hashlib
+import pytest
+from src.blockchain.block import Block
+from src.blockchain.mining import ascii_nonce, difficulty_target, find_nonce, find_nonce_parallel
+
+@pytest.fixture
+def block():
+    return Block(1, 1700000000.0, [{"from": "0x1", "to": "0x2", "amount": 10}], "0" * 64)
+
+def test_difficulty_target():
+    for difficulty in range(0, 5):
+        target = difficulty_target(difficulty)
+        for nonce in range(200):
+            digest = hashlib.sha256(str(nonce).encode()).digest()
+            assert (digest < target) == digest.hex().startswith("0" * difficulty)
+
+def test_mine_block(block):
+    block_hash = block.mine_block(2)
+    assert block_hash.startswith("00")
+    assert block_hash == block.calculate_hash()
+
+def test_find_nonce_matches_full_hash():
+    prefix = b"previous-hash-and-transactions"
+    result = find_nonce(prefix, 2, nonce_encoder=ascii_nonce)
+    assert result.hash == hashlib.sha256(prefix + str(result.nonce).encode()).hexdigest()
+    assert result.hash.startswith("00")
+    assert result.hashes == result.nonce + 1
+    assert result.hashrate >= 0
+
+def test_find_nonce_gives_up():
+    assert find_nonce(b"prefix", 64, max_hashes=10) is None
+
+def test_find_nonce_parallel():
+    prefix = b"parallel-prefix"
+    result = find_nonce_parallel(prefix, 3, workers=2, chunk_size=500, nonce_encoder=ascii_nonce)
+    assert result.hash == hashlib.sha256(prefix + str(result.nonce).encode()).hexdigest()
+    assert result.hash.startswith("000")
+    assert result.hashes > 0
+
+def test_mine_block_with_workers(block):
+    block_hash = block.mine_block(2, workers=2)
+    assert block_hash.startswith("00")
+    assert block_hash == block.calculate_hash()
+
+def failing_encoder(nonce):
+    raise ValueError("cannot encode nonce")
+
+def test_find_nonce_parallel_raises_when_workers_die():
+    with pytest.raises(RuntimeError):
+        find_nonce_parallel(b"prefix", 2, workers=2, nonce_encoder=failing_encoder)
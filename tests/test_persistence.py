@@ -0,0 +1,163 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from src.blockchain.block_cache import BlockCache
+from src.blockchain.core import BlockchainCore
+from src.blockchain.persistence import reconcile_accounts, upsert_accounts
+from src.models import Account, Base, Block, Transaction
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return engine
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def mine_blocks(core, count):
+    blocks = []
+    for index in range(count):
+        core.add_transaction("sender", "receiver", float(index + 1))
+        block = core.create_block("miner")
+        assert core.validate_block(block) == True
+        core.save_block(block)
+        blocks.append(block)
+    return blocks
+
+def test_save_block_persists_transactions(session):
+    core = BlockchainCore(session, difficulty=1)
+    block = mine_blocks(core, 1)[0]
+
+    stored = session.query(Block).filter(Block.hash == block.hash).one()
+    assert stored.id == block.id
+    assert sorted(tx.amount for tx in stored.transactions) == [1.0, 50.0]
+
+def test_blocks_grouped_per_commit(engine, session):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    commits = []
+    event.listen(session, "after_commit", lambda session: commits.append(True))
+
+    core = BlockchainCore(session, difficulty=1, blocks_per_commit=3)
+    blocks = mine_blocks(core, 4)
+    assert len(commits) == 1
+    assert session.query(Block).count() == 3
+
+    # The buffered fourth block still chains onto the third and lands on flush
+    assert blocks[3].previous_hash == blocks[2].hash
+    core.flush()
+    assert len(commits) == 2
+    assert session.query(Transaction).count() == 8
+
+    inserts = [statement for statement in statements if statement.startswith("INSERT")]
+    assert len(inserts) == 6  # One statement each for blocks, transactions and accounts per commit
+
+def test_address_and_link_queries_use_indexes(engine):
+    with engine.connect() as connection:
+        history = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM transactions "
+            "WHERE from_address = 'a' OR to_address = 'a' ORDER BY block_id"
+        )).fetchall()
+        parent = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM blocks WHERE previous_hash = 'h'"
+        )).fetchall()
+
+    history_plan = " ".join(row[-1] for row in history)
+    assert "ix_transactions_from_address_block_id" in history_plan
+    assert "ix_transactions_to_address_block_id" in history_plan
+    assert "ix_blocks_previous_hash" in parent[0][-1]
+
+def test_accounts_updated_with_blocks(session):
+    core = BlockchainCore(session, difficulty=1, blocks_per_commit=2)
+    mine_blocks(core, 3)
+    assert core.get_balance("miner") == 100.0  # Third block is still buffered
+    core.flush()
+
+    assert core.get_balance("miner") == 150.0
+    assert core.get_balance("receiver") == 6.0
+    assert core.get_balance("sender") == -6.0
+    assert core.get_balance("nobody") == 0.0
+    sender = session.query(Account).filter(Account.address == "sender").one()
+    assert sender.nonce == 3
+
+def test_reconcile_rebuilds_accounts(session):
+    core = BlockchainCore(session, difficulty=1)
+    mine_blocks(core, 2)
+    session.query(Account).filter(Account.address == "miner").update({"balance": 999.0})
+    session.add(Account(address="ghost", balance=5.0, nonce=0))
+    session.commit()
+
+    assert reconcile_accounts(session) == 4
+    assert core.get_balance("miner") == 100.0
+    assert core.get_balance("ghost") == 0.0
+    assert session.query(Account).filter(Account.address == "sender").one().nonce == 2
+
+def test_generic_account_upsert(engine, session, monkeypatch):
+    upsert_accounts(session, {"a": (10.0, 0)})
+    monkeypatch.setattr(engine.dialect, "name", "generic")
+    upsert_accounts(session, {"a": (-4.0, 1), "b": (4.0, 0)})
+    session.commit()
+
+    balances = {
+        account.address: (account.balance, account.nonce) for account in session.query(Account)
+    }
+    assert balances == {"a": (6.0, 1), "b": (4.0, 0)}
+
+def test_tip_and_parent_served_from_cache(engine, session):
+    core = BlockchainCore(session, difficulty=1)
+    mine_blocks(core, 1)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    mine_blocks(core, 3)
+    assert [statement for statement in statements if "FROM blocks" in statement] == []
+    assert core.block_cache.tip[1] == session.query(Block).order_by(Block.id.desc()).first().hash
+
+def test_block_cache_invalidated_on_rollback(session):
+    core = BlockchainCore(session, difficulty=1)
+    block = mine_blocks(core, 1)[0]
+    assert core.block_cache.get_id(block.hash) == block.id
+
+    duplicate = Block(hash=block.hash, previous_hash=block.hash, nonce=0, difficulty=1)
+    with pytest.raises(Exception):
+        core.save_block(duplicate)
+    assert core.block_cache.tip is None
+    assert len(core.block_cache) == 0
+
+    # The next block reloads the tip from the database
+    assert mine_blocks(core, 1)[0].previous_hash == block.hash
+
+def test_core_does_not_outlive_its_session_listener(session):
+    import gc
+    import weakref
+
+    core = BlockchainCore(session, difficulty=1)
+    listener = core._remove_listener.peek()[3]
+    mine_blocks(core, 1)
+    core.close()
+    assert event.contains(session, "after_rollback", listener) == False
+
+    abandoned = BlockchainCore(session, difficulty=1)
+    listener = abandoned._remove_listener.peek()[3]
+    abandoned = weakref.ref(abandoned)
+    gc.collect()
+    assert abandoned() is None
+    assert event.contains(session, "after_rollback", listener) == False
+
+def test_block_cache_evicts_least_recently_used():
+    cache = BlockCache(capacity=2)
+    cache.remember(1, "a")
+    cache.remember(2, "b")
+    assert cache.get_id("a") == 1
+    cache.set_tip(3, "c")
+
+    assert cache.get_id("b") is None
+    assert cache.get_id("a") == 1
+    assert cache.tip == (3, "c")
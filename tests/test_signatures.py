@@ -0,0 +1,70 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from src.blockchain.block import Block
+
+pytest.importorskip("cryptography")
+
+from src.blockchain.signatures import (
+    generate_keypair,
+    public_key_for,
+    sign_message,
+    verify_batch,
+    verify_signature,
+)
+from src.blockchain.transaction import Transaction, sign_transaction, verify_transactions
+
+@pytest.fixture
+def keypair():
+    return generate_keypair()
+
+def test_sign_and_verify(keypair):
+    private_key, public_key = keypair
+    assert public_key_for(private_key) == public_key
+
+    signature = sign_message(private_key, b"payload")
+    assert verify_signature(public_key, b"payload", signature) == True
+    assert verify_signature(public_key, b"tampered", signature) == False
+    assert verify_signature(public_key, b"payload", "not hex") == False
+    assert verify_signature("00", b"payload", signature) == False
+
+def test_transaction_signature(keypair):
+    private_key, public_key = keypair
+    tx = Transaction(public_key, "bob", 10, 1.0)
+    assert tx.is_valid() == False
+
+    tx.sign(private_key)
+    assert tx.is_valid() == True
+
+    tx.amount = 11
+    assert tx.is_valid() == False
+
+def test_signed_dict_transactions(keypair):
+    private_key, public_key = keypair
+    tx = sign_transaction({"from": public_key, "to": "bob", "amount": 5, "fee": 1}, private_key)
+    forged = dict(tx, amount=500)
+    reward = {"from": "network", "to": public_key, "amount": 100, "type": "reward"}
+
+    assert verify_transactions([tx, forged, reward]) == [True, False, True]
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_verify_batch_on_pool(keypair, processes):
+    private_key, public_key = keypair
+    checks = []
+    for index in range(200):
+        message = str(index).encode()
+        checks.append((public_key, message, sign_message(private_key, message)))
+    checks[150] = (public_key, b"forged", checks[150][2])
+
+    results = verify_batch(checks, workers=4, processes=processes)
+    assert results == [index != 150 for index in range(200)]
+
+def test_verify_block_with_shared_executor(keypair):
+    private_key, public_key = keypair
+    transactions = [
+        sign_transaction({"from": public_key, "to": "bob", "amount": amount, "fee": 1}, private_key)
+        for amount in range(100)
+    ]
+    block = Block(1, 0.0, transactions, "0").seal()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert all(verify_transactions(block.transactions, workers=2, executor=executor)) == True
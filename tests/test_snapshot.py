@@ -0,0 +1,88 @@
+import os
+import pytest
+from datetime import datetime
+from src.blockchain.block import Block
+from src.blockchain.block_store import BlockStore
+from src.blockchain.blockchain import Blockchain
+from src.blockchain.ledger import BalanceLedger
+from src.blockchain.snapshot import SnapshotManager
+from src.governance.governance import Governance, ProposalStatus, ProposalType
+from src.staking.staking_pool import StakingPool
+
+def append_reward(store, address, amount):
+    latest = store[-1]
+    reward = {"from": "network", "to": address, "amount": amount, "type": "reward"}
+    store.append(Block(latest.index + 1, datetime.now(), [reward], latest.hash))
+
+@pytest.fixture
+def store(tmp_path):
+    store = BlockStore(str(tmp_path / "blocks"))
+    yield store
+    store.close()
+
+def test_snapshot_round_trip(tmp_path):
+    staking_pool = StakingPool()
+    staking_pool.stake("0xstaker", 500, lock_days=30)
+    governance = Governance()
+    proposal_id = governance.create_proposal("Title", "Description", "0xproposer",
+                                             ProposalType.PARAMETER_CHANGE, voting_power=200000)
+    governance.proposals[proposal_id].status = ProposalStatus.ACTIVE
+    governance.vote(proposal_id, "0x1", "for", 5000)
+
+    manager = SnapshotManager(str(tmp_path), staking_pool=staking_pool, governance=governance)
+    blockchain = Blockchain()
+    blockchain.add_validator("0xvalidator", 2000)
+    blockchain.ledger.balances = {"0x1": 10}
+    blockchain.ledger.nonces = {"0x1": 3}
+    blockchain.snapshot_manager = manager
+    blockchain.take_snapshot()
+
+    restored_staking = StakingPool()
+    restored_governance = Governance()
+    restored = SnapshotManager(str(tmp_path), staking_pool=restored_staking,
+                               governance=restored_governance)
+    snapshot = restored.load_latest()
+    fresh = Blockchain()
+    restored.restore(snapshot, fresh.ledger, fresh.pos)
+
+    assert fresh.get_balance("0x1") == 10
+    assert fresh.get_nonce("0x1") == 3
+    assert fresh.pos.validators["0xvalidator"].stake == 2000
+    assert restored_staking.stakers == staking_pool.stakers
+    assert restored_governance.get_proposal(proposal_id) == governance.get_proposal(proposal_id)
+
+def test_startup_replays_only_tail(tmp_path, store):
+    manager = SnapshotManager(str(tmp_path / "snapshots"))
+    Blockchain(block_store=store, snapshot_manager=manager)
+    append_reward(store, "0x1", 5)
+    append_reward(store, "0x1", 7)
+
+    restarted = Blockchain(block_store=store, snapshot_manager=manager)
+    assert restarted.get_balance("0x1") == 12
+    restarted.take_snapshot()
+
+    # An inflated snapshot at height 1 shows only the block above it is replayed
+    inflated = BalanceLedger()
+    inflated.balances = {"0x1": 100}
+    manager.write(1, store[1].hash, inflated)
+    for height in manager.list_heights()[1:]:
+        os.unlink(manager._path(height))
+    assert Blockchain(block_store=store, snapshot_manager=manager).get_balance("0x1") == 107
+
+def test_snapshot_ignored_if_chain_diverged(tmp_path, store):
+    manager = SnapshotManager(str(tmp_path / "snapshots"))
+    Blockchain(block_store=store, snapshot_manager=manager)
+    append_reward(store, "0x1", 5)
+
+    inflated = BalanceLedger()
+    inflated.balances = {"0x1": 100}
+    manager.write(1, "not-the-block-hash", inflated)
+    assert Blockchain(block_store=store, snapshot_manager=manager).get_balance("0x1") == 5
+
+def test_old_snapshots_are_pruned(tmp_path):
+    manager = SnapshotManager(str(tmp_path), keep=2)
+    blockchain = Blockchain()
+    for height in (10, 20, 30):
+        manager.write(height, "hash", blockchain.ledger)
+    assert manager.list_heights() == [20, 30]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]